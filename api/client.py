@@ -56,6 +56,7 @@ class Uploader(QRunnable):
         self.headers = headers
         self.session = requests.Session()
         self._is_cancelled = False
+        self._last_progress_percent = -1
 
     def run(self):
         """The main work of the uploader thread."""
@@ -88,7 +89,15 @@ class Uploader(QRunnable):
         if self._is_cancelled:
             # This will cause the session.post() to raise an exception.
             raise IOError("Upload cancelled by user.")
-        self.signals.progress.emit(monitor.bytes_read, monitor.len)
+        # The encoder reports every small read; only emit when the whole
+        # percentage changes (and always on completion) to avoid flooding
+        # the receiving thread with queued signals.
+        total = monitor.len
+        percent = monitor.bytes_read * 100 // total if total > 0 else 100
+        if percent == self._last_progress_percent and monitor.bytes_read < total:
+            return
+        self._last_progress_percent = percent
+        self.signals.progress.emit(monitor.bytes_read, total)
         
     def cancel(self):
         """Cancels the upload."""
@@ -5,14 +5,43 @@
 实现音频片段的并发上传和转录处理
 """
 
-import os
-import json
+import re
 import time
 from typing import List, Dict, Any, Optional, Callable
-from PySide6.QtCore import QObject, Signal, QMutex, QMutexLocker, QSemaphore, QRunnable, QEventLoop, QTimer
+from PySide6.QtCore import QObject, Signal, QMutex, QMutexLocker, QSemaphore, QRunnable
 
 from api.client import ElevenLabsSTTClient
 
+# 重试退避参数（秒）：限流错误使用更长的初始等待，每次重试翻倍，不超过上限
+RATE_LIMIT_BACKOFF_BASE = 5.0
+TRANSIENT_BACKOFF_BASE = 1.0
+MAX_RETRY_BACKOFF = 60.0
+
+_RATE_LIMIT_PATTERN = re.compile(r"\b429\b|rate.?limit|quota|throttl|too many requests", re.IGNORECASE)
+_TRANSIENT_PATTERN = re.compile(r"\b(408|500|502|503|504)\b|timed? ?out|connection", re.IGNORECASE)
+_CLIENT_ERROR_PATTERN = re.compile(r"\b4\d\d Client Error\b")
+
+
+class UploadPreparationError(Exception):
+    """无法为片段准备上传任务（如片段文件不存在），重试也不会成功。"""
+
+
+def _classify_error(error: Exception) -> str:
+    """将上传错误分类为 "rate_limit"、"transient" 或 "fatal"。
+
+    无法准备上传任务和其他 4xx 客户端错误视为不可重试，未能识别的错误按临时错误处理。
+    """
+    if isinstance(error, UploadPreparationError):
+        return "fatal"
+    message = str(error)
+    if _RATE_LIMIT_PATTERN.search(message):
+        return "rate_limit"
+    if _TRANSIENT_PATTERN.search(message):
+        return "transient"
+    if _CLIENT_ERROR_PATTERN.search(message):
+        return "fatal"
+    return "transient"
+
 
 class ChunkProcessorSignals(QObject):
     """片段处理任务的信号"""
@@ -24,14 +53,13 @@ class ChunkProcessorSignals(QObject):
 class ChunkProcessorTask(QRunnable):
     """单个音频片段处理任务"""
 
-    def __init__(self, chunk_index: int, chunk_path: str, time_offset: float,
+    def __init__(self, chunk_index: int, chunk_path: str,
                  language_code: str, tag_audio_events: bool, ffmpeg_available: bool,
                  max_retries: int, parent_processor):
         super().__init__()
         self.signals = ChunkProcessorSignals()
         self.chunk_index = chunk_index
         self.chunk_path = chunk_path
-        self.time_offset = time_offset
         self.language_code = language_code
         self.tag_audio_events = tag_audio_events
         self.ffmpeg_available = ffmpeg_available
@@ -70,22 +98,21 @@ class ChunkProcessorTask(QRunnable):
                     )
 
                     if not uploader:
-                        raise Exception(f"无法为片段 {self.chunk_index} 准备上传任务")
+                        raise UploadPreparationError(f"无法为片段 {self.chunk_index} 准备上传任务")
 
                     # 连接进度信号
                     uploader.signals.progress.connect(self.signals.progress_updated)
 
-                    # 执行上传（同步等待）
-                    transcript_json = self._execute_upload_sync(uploader)
-
-                    # 调整时间偏移
-                    words = transcript_json.get("words", [])
-                    for word in words:
-                        word["start"] = round(word["start"] + self.time_offset, 3)
-                        word["end"] = round(word["end"] + self.time_offset, 3)
-
-                    # 保存分段JSON文件
-                    self._save_chunk_json(transcript_json)
+                    # 登记正在进行的上传，便于取消时中断
+                    with QMutexLocker(self.parent_processor.mutex):
+                        self.parent_processor.active_uploaders.add(uploader)
+                    try:
+                        # 执行上传（同步等待）
+                        # 时间偏移不在这里应用，由调用方在最终合并时按片段索引统一处理
+                        transcript_json = self._execute_upload_sync(uploader)
+                    finally:
+                        with QMutexLocker(self.parent_processor.mutex):
+                            self.parent_processor.active_uploaders.discard(uploader)
 
                     # 发送完成信号
                     self.signals.chunk_completed.emit(self.chunk_index, transcript_json)
@@ -93,11 +120,16 @@ class ChunkProcessorTask(QRunnable):
 
                 except Exception as e:
                     last_error = e
+                    error_kind = _classify_error(e)
+                    if error_kind == "fatal" or self.parent_processor.is_cancelled:
+                        break
                     if attempt < self.max_retries - 1:
-                        wait_time = 2 ** attempt  # 指数退避
-                        time.sleep(wait_time)
+                        # 指数退避，限流错误等待更久；重试同样遵守速率限制
+                        base = RATE_LIMIT_BACKOFF_BASE if error_kind == "rate_limit" else TRANSIENT_BACKOFF_BASE
+                        time.sleep(min(MAX_RETRY_BACKOFF, base * 2 ** attempt))
+                        self.parent_processor._wait_for_rate_limit()
 
-            # 所有重试都失败
+            # 所有重试都失败或遇到不可重试的错误
             raise last_error or Exception("未知错误")
 
         except Exception as e:
@@ -110,56 +142,31 @@ class ChunkProcessorTask(QRunnable):
             self.parent_processor.semaphore.release()
 
     def _execute_upload_sync(self, uploader) -> dict:
-        """同步执行上传任务"""
+        """在当前线程中直接执行上传任务
 
+        任务本身已运行在线程池线程中，不再把上传器投递到全局线程池再用嵌套事件循环等待，
+        避免线程池只有一个线程时互相等待而死锁。超时由上传器的请求超时控制。
+        """
         result = {}
         error = {}
-        loop = QEventLoop()
-
-        def on_finished(transcript_json):
-            result['data'] = transcript_json
-            loop.quit()
-
-        def on_error(error_message):
-            error['message'] = error_message
-            loop.quit()
-
-        # 连接信号
-        uploader.signals.finished.connect(on_finished)
-        uploader.signals.error.connect(on_error)
 
-        # 设置超时定时器
-        timeout_timer = QTimer()
-        timeout_timer.setSingleShot(True)
-        timeout_timer.timeout.connect(loop.quit)
-        timeout_timer.start(1800000)  # 30分钟超时
+        # 上传器在当前线程中发出的信号会同步送达。取消由界面线程调用 uploader.cancel()，
+        # 它发出的错误信号会排队到没有事件循环的当前线程而无法送达，因此上传返回后
+        # 直接检查取消标志，避免取消后才返回的结果仍被当作完成
+        uploader.signals.finished.connect(lambda data: result.setdefault('data', data))
+        uploader.signals.error.connect(lambda message: error.setdefault('message', message))
 
-        # 启动上传
-        from PySide6.QtCore import QThreadPool
-        QThreadPool.globalInstance().start(uploader)
+        uploader.run()
 
-        # 等待完成
-        loop.exec()
-
-        timeout_timer.stop()
-
-        if 'data' in result:
-            return result['data']
-        elif 'message' in error:
+        if self.parent_processor.is_cancelled:
+            raise Exception("任务被取消")
+        if 'message' in error:
             raise Exception(error['message'])
+        elif 'data' in result:
+            return result['data']
         else:
             raise Exception("上传超时或被取消")
 
-    def _save_chunk_json(self, transcript_json: dict):
-        """保存分段JSON文件"""
-        try:
-            base_chunk_path, _ = os.path.splitext(self.chunk_path)
-            segment_json_path = base_chunk_path + ".json"
-            with open(segment_json_path, 'w', encoding='utf-8') as f:
-                json.dump(transcript_json, f, ensure_ascii=False, indent=4)
-        except Exception:
-            pass  # 忽略保存错误
-
 
 class AsyncChunkProcessor(QObject):
     """异步音频片段处理器"""
@@ -168,7 +175,7 @@ class AsyncChunkProcessor(QObject):
     chunk_started = Signal(int)  # chunk_index
     chunk_completed = Signal(int, dict)  # chunk_index, transcript_json
     chunk_failed = Signal(int, str)  # chunk_index, error_message
-    all_chunks_completed = Signal(dict)  # combined_transcript
+    all_chunks_completed = Signal()  # 所有片段完成（结果已通过 chunk_completed 逐个发送）
     processing_failed = Signal(str)  # error_message
     progress_updated = Signal(int, int, int)  # chunk_index, bytes_sent, total_bytes
 
@@ -181,33 +188,37 @@ class AsyncChunkProcessor(QObject):
         self.completed_chunks: Dict[int, dict] = {}
         self.failed_chunks: Dict[int, str] = {}
         self.processing_chunks: set = set()
+        self.active_uploaders: set = set()
         self.total_chunks = 0
+        self.chunk_numbers: List[int] = []
         self.is_cancelled = False
 
         # 线程安全
         self.mutex = QMutex()
         self.semaphore = QSemaphore(max_concurrent_chunks)
 
-        # 速率限制
-        self.request_times: List[float] = []
+        # 速率限制：相邻请求之间至少间隔 60 / 每分钟请求上限 秒，
+        # next_request_time 为下一个请求最早可发送的时刻（monotonic）
         self.max_requests_per_minute = 30
+        self.next_request_time = 0.0
+        self.rate_mutex = QMutex()
 
     def process_chunks_async(self, chunk_paths: List[str],
-                           split_duration_sec: float,
                            language_code: str,
                            tag_audio_events: bool,
                            ffmpeg_available: bool,
-                           log_callback: Optional[Callable[[str], None]] = None) -> bool:
+                           log_callback: Optional[Callable[[str], None]] = None,
+                           chunk_numbers: Optional[List[int]] = None) -> bool:
         """
         异步处理所有音频片段
 
         Args:
             chunk_paths: 音频片段文件路径列表
-            split_duration_sec: 每个片段的时长（秒）
             language_code: 语言代码
             tag_audio_events: 是否标记音频事件
             ffmpeg_available: FFmpeg是否可用
             log_callback: 日志回调函数
+            chunk_numbers: 各片段在整个任务中的序号（从 1 开始），用于错误信息；默认按列表顺序编号
 
         Returns:
             bool: 是否成功启动处理
@@ -216,6 +227,7 @@ class AsyncChunkProcessor(QObject):
             return False
 
         self.total_chunks = len(chunk_paths)
+        self.chunk_numbers = chunk_numbers or list(range(1, self.total_chunks + 1))
         self.completed_chunks.clear()
         self.failed_chunks.clear()
         self.processing_chunks.clear()
@@ -224,12 +236,6 @@ class AsyncChunkProcessor(QObject):
         if log_callback:
             log_callback(f"开始异步处理 {self.total_chunks} 个音频片段...")
 
-        # 预计算时间偏移
-        time_offsets = {
-            i: i * split_duration_sec
-            for i in range(self.total_chunks)
-        }
-
         # 使用Qt的线程池而不是Python的ThreadPoolExecutor
         # 这样可以更好地与Qt信号系统集成
         try:
@@ -242,7 +248,6 @@ class AsyncChunkProcessor(QObject):
                 processor = ChunkProcessorTask(
                     chunk_index=i,
                     chunk_path=chunk_path,
-                    time_offset=time_offsets[i],
                     language_code=language_code,
                     tag_audio_events=tag_audio_events,
                     ffmpeg_available=ffmpeg_available,
@@ -275,104 +280,75 @@ class AsyncChunkProcessor(QObject):
 
 
     def _wait_for_rate_limit(self):
-        """等待速率限制"""
-        with QMutexLocker(self.mutex):
-            now = time.time()
-
-            # 清理超过1分钟的请求记录
-            self.request_times = [
-                t for t in self.request_times
-                if now - t < 60
-            ]
+        """等待速率限制
 
-            # 检查是否需要等待
-            if len(self.request_times) >= self.max_requests_per_minute:
-                oldest_request = min(self.request_times)
-                wait_time = 60 - (now - oldest_request)
-                if wait_time > 0:
-                    time.sleep(wait_time)
+        按最小请求间隔为每个请求分配发送时刻，请求被均匀地分散开，
+        不会像按分钟计数那样在窗口边界处集中爆发。
+        锁只在分配时刻时短暂持有，实际等待在锁外进行，不会阻塞其他片段。
+        """
+        min_interval = 60.0 / max(1, self.max_requests_per_minute)
+        with QMutexLocker(self.rate_mutex):
+            now = time.monotonic()
+            send_at = max(now, self.next_request_time)
+            self.next_request_time = send_at + min_interval
 
-            # 记录新请求
-            self.request_times.append(now)
+        wait_time = send_at - now
+        if wait_time > 0:
+            time.sleep(wait_time)
 
     def _on_chunk_completed(self, chunk_index: int, transcript_json: dict):
         """片段完成回调"""
+        # 信号在锁外发出，接收方可能在回调中再次查询进度
         with QMutexLocker(self.mutex):
             self.completed_chunks[chunk_index] = transcript_json
-            self.chunk_completed.emit(chunk_index, transcript_json)
-
-            # 检查是否所有片段都完成
             total_processed = len(self.completed_chunks) + len(self.failed_chunks)
-            if total_processed == self.total_chunks:
-                if not self.failed_chunks:
-                    # 所有片段都成功，合并结果
-                    combined = self._merge_transcripts()
-                    self.all_chunks_completed.emit(combined)
-                else:
-                    # 有失败的片段
-                    failed_list = list(self.failed_chunks.keys())
-                    error_msg = f"以下片段处理失败: {failed_list}"
-                    self.processing_failed.emit(error_msg)
+            all_done = total_processed == self.total_chunks
+            failure_message = self._failure_message() if all_done else ""
+
+        self.chunk_completed.emit(chunk_index, transcript_json)
+
+        # 检查是否所有片段都完成
+        if all_done:
+            if not failure_message:
+                # 所有片段都成功，由接收方按索引合并各片段结果
+                self.all_chunks_completed.emit()
+            else:
+                # 有失败的片段
+                self.processing_failed.emit(failure_message)
+
+    def _failure_message(self) -> str:
+        """汇总失败片段及其错误信息，没有失败片段时返回空字符串；调用方需持有 self.mutex。"""
+        if not self.failed_chunks:
+            return ""
+        details = "; ".join(f"片段 {self.chunk_numbers[chunk_index]}: {message}"
+                            for chunk_index, message in sorted(self.failed_chunks.items()))
+        return f"以下片段处理失败: {details}"
 
     def _on_chunk_failed(self, chunk_index: int, error_message: str):
         """片段失败回调"""
         with QMutexLocker(self.mutex):
             self.failed_chunks[chunk_index] = error_message
-            self.chunk_failed.emit(chunk_index, error_message)
-
-            # 检查是否所有片段都完成
             total_processed = len(self.completed_chunks) + len(self.failed_chunks)
-            if total_processed == self.total_chunks:
-                failed_list = list(self.failed_chunks.keys())
-                error_msg = f"以下片段处理失败: {failed_list}"
-                self.processing_failed.emit(error_msg)
+            all_done = total_processed == self.total_chunks
+            failure_message = self._failure_message() if all_done else ""
 
-    def _merge_transcripts(self) -> dict:
-        """按顺序合并所有转录结果，保持完整的JSON结构
+        self.chunk_failed.emit(chunk_index, error_message)
 
-        注意：每个片段的时间偏移已经在ChunkTask.run()中应用过了，
-        这里只需要简单合并，不需要重复计算时间偏移。
-        """
-        if not self.completed_chunks:
-            return {}
-
-        # 获取第一个片段作为模板，保留完整的元数据结构
-        first_chunk_index = min(self.completed_chunks.keys())
-        combined_transcript = self.completed_chunks[first_chunk_index].copy()
-
-        # 确保有words和text字段
-        if "words" not in combined_transcript:
-            combined_transcript["words"] = []
-        if "text" not in combined_transcript:
-            combined_transcript["text"] = ""
-
-        # 按片段索引顺序合并（时间偏移已经在各个片段中处理过了）
-        for i in sorted(self.completed_chunks.keys()):
-            if i == first_chunk_index:
-                # 第一个片段已经作为模板，跳过
-                continue
-
-            transcript = self.completed_chunks[i]
-
-            # 直接追加words（时间偏移已经在ChunkTask中处理）
-            words = transcript.get("words", [])
-            combined_transcript["words"].extend(words)
-
-            # 拼接文本
-            text = transcript.get("text", "")
-            if text:
-                if combined_transcript["text"]:
-                    combined_transcript["text"] += " "
-                combined_transcript["text"] += text
-
-        return combined_transcript
+        # 检查是否所有片段都完成
+        if all_done:
+            self.processing_failed.emit(failure_message)
 
     def cancel(self):
         """取消所有处理"""
         with QMutexLocker(self.mutex):
             self.is_cancelled = True
-            # 发送取消信号，让正在等待的任务能够及时退出
-            self.processing_failed.emit("用户取消了任务")
+            uploaders = list(self.active_uploaders)
+
+        # 中断正在进行的上传
+        for uploader in uploaders:
+            uploader.cancel()
+        # 发送取消信号，让正在等待的任务能够及时退出
+        self.processing_failed.emit("用户取消了任务")
 
     def get_progress_info(self) -> Dict[str, Any]:
         """获取处理进度信息"""
@@ -11,6 +11,9 @@ LANGUAGES = {"韩语": "ko", "日语": "ja", "中文": "zh", "英文": "en", "
 # --- 字幕生成规则 ---
 MAX_LINES_PER_SUBTITLE = 2
 
+# 按 CJK 规则处理的语言代码（ISO 639-3 / 639-1，取语言代码前 3 个字符比较）
+CJK_LANGUAGE_CODES = frozenset({"zho", "jpn", "kor", "chi", "zh", "ja", "ko"})
+
 # CPS（每秒字符数）- 根据语言动态调整
 CPS_SETTINGS = {
     "cjk": 11,      # 中文、日文、韩文：9-11字符/秒（取上限）
@@ -45,6 +48,15 @@ DEFAULT_SUBTITLE_SETTINGS = {
 
 # 其他设置
 DEFAULT_SPLIT_DURATION_MIN = 90  # 长文件自动切分的默认阈值（分钟）
+# 需要先提取音频再上传的视频文件扩展名（小写）
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mkv", ".mov", ".avi", ".flv", ".webm"})
+# 文件选择对话框中列出的音频文件扩展名（小写）
+AUDIO_EXTENSIONS = frozenset({".mp3", ".wav", ".flac", ".m4a", ".aac"})
+# 切分时可直接流复制（不重新编码）的音频编码及对应的片段扩展名，其余编码回退到 MP3 重新编码
+SEGMENT_COPY_CODEC_EXTENSIONS = {"mp3": ".mp3", "aac": ".aac", "opus": ".ogg"}
+# 断点检查点：每完成一个片段写入 <原文件名>.ckpt.json，超过有效期的检查点不再用于恢复
+CHECKPOINT_SCHEMA_VERSION = 2
+CHECKPOINT_MAX_AGE_SEC = 24 * 60 * 60
 
 # --- UI 样式表 ---
 STYLESHEET = """
@@ -79,7 +91,7 @@ QPushButton:disabled {
     color: #888888;
     border-color: #555555;
 }
-QTextEdit {
+QTextEdit, QPlainTextEdit {
     background-color: #333333;
     border: 1px solid #555555;
     border-radius: 4px;
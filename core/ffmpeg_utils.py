@@ -68,7 +68,7 @@ def extract_audio(video_path: str, output_path: str, log_callback=None) -> bool:
             startupinfo = subprocess.STARTUPINFO()
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
 
-        command = ["ffmpeg", "-i", video_path, "-vn", "-c:a", "copy", "-y", output_path]
+        command = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", video_path, "-vn", "-c:a", "copy", "-y", output_path]
         
         subprocess.run(command, check=True, capture_output=True, text=True, encoding='utf-8', startupinfo=startupinfo)
         
@@ -8,7 +8,7 @@
 
 from typing import Dict, List, Tuple
 import re
-from .config import MIN_SUBTITLE_DURATION, MIN_SUBTITLE_GAP, CPS_SETTINGS, CPL_SETTINGS
+from .config import MIN_SUBTITLE_DURATION, MIN_SUBTITLE_GAP, CPS_SETTINGS, CPL_SETTINGS, CJK_LANGUAGE_CODES
 
 
 class IntelligentMerger:
@@ -53,7 +53,7 @@ class IntelligentMerger:
     
     def _is_cjk_language(self) -> bool:
         """检查是否为CJK语言"""
-        return self.language in ["zho", "jpn", "kor", "chi", "zh", "ja", "ko"]
+        return self.language in CJK_LANGUAGE_CODES
     
     def _calculate_cps(self, text: str, duration: float) -> float:
         """计算CPS（每秒字符数）"""
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+这个文件包含了转录结果 JSON 的序列化与写盘工具函数。
+安装了 orjson 时使用它进行序列化，否则回退到标准库 json，两者输出格式一致。
+"""
+
+import os
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """将数据序列化为 UTF-8 编码的 JSON。
+
+    Args:
+        data: 要序列化的数据
+        indent: 是否以 2 空格缩进输出；否则输出紧凑的单行 JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_json(path: str) -> Any:
+    """读取 JSON 文件，安装了 orjson 时使用它解析。"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def write_json_atomic(path: str, data: Any, indent: bool = False):
+    """先写入临时文件再替换目标文件，避免留下写了一半的 JSON。
+
+    写入失败时删除临时文件并抛出 OSError。
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps_json(data, indent))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
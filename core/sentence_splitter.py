@@ -8,6 +8,8 @@
 
 from typing import Dict, List, Tuple
 
+from .config import CJK_LANGUAGE_CODES
+
 
 class SentenceSplitter:
     """
@@ -38,10 +40,18 @@ class SentenceSplitter:
         self.all_split_punct = (self.high_priority_punct +
                                self.medium_priority_punct +
                                self.low_priority_punct)
+
+        # 标点符号到优先级的查找表，同一符号出现在多个列表中时以较高优先级为准
+        self._punct_priority: Dict[str, int] = {}
+        for priority, punct_list in enumerate((self.high_priority_punct,
+                                               self.medium_priority_punct,
+                                               self.low_priority_punct)):
+            for punct in punct_list:
+                self._punct_priority.setdefault(punct, priority)
     
     def _is_cjk_language(self) -> bool:
         """检查是否为CJK语言"""
-        return self.language in ["zho", "jpn", "kor", "chi", "zh", "ja", "ko"]
+        return self.language in CJK_LANGUAGE_CODES
     
 
     
@@ -55,14 +65,7 @@ class SentenceSplitter:
         Returns:
             优先级 (0=高, 1=中, 2=低, -1=不是分割标点)
         """
-        if punct in self.high_priority_punct:
-            return 0
-        elif punct in self.medium_priority_punct:
-            return 1
-        elif punct in self.low_priority_punct:
-            return 2
-        else:
-            return -1
+        return self._punct_priority.get(punct, -1)
     
     def _word_ends_with_split_punct(self, word_info: Dict) -> Tuple[bool, str, int]:
         """
@@ -87,13 +90,14 @@ class SentenceSplitter:
         
         return False, "", -1
     
-    def _should_split_at_word(self, word_info: Dict, accumulated_words: List[Dict]) -> bool:
+    def _should_split_at_word(self, word_info: Dict, accumulated_count: int, accumulated_chars: int) -> bool:
         """
         判断是否应该在此单词处分割句子
 
         Args:
             word_info: 当前单词信息
-            accumulated_words: 已累积的单词列表
+            accumulated_count: 当前组中此单词之前已累积的单词数
+            accumulated_chars: 已累积单词的文本总长度（含并入的空格）
 
         Returns:
             是否应该分割
@@ -110,15 +114,14 @@ class SentenceSplitter:
 
         # 中优先级标点符号：需要有足够的内容
         if priority == 1:
-            if len(accumulated_words) >= 3:  # 至少3个词
+            if accumulated_count >= 3:  # 至少3个词
                 return True
 
         # 低优先级标点符号：需要更多内容且不能太频繁分割
         if priority == 2:
-            if len(accumulated_words) >= 5:  # 至少5个词
+            if accumulated_count >= 5:  # 至少5个词
                 # 检查前面是否刚刚有过分割
-                total_chars = sum(len(w.get('text', '')) for w in accumulated_words)
-                if total_chars >= 15:  # 至少15个字符
+                if accumulated_chars >= 15:  # 至少15个字符
                     return True
 
         return False
@@ -138,6 +141,8 @@ class SentenceSplitter:
         
         sentence_groups = []
         current_group = []
+        # 当前组已累积的文本总长度，随单词增减维护，避免每个单词都重新求和
+        current_chars = 0
         
         for i, word in enumerate(words):
             # 跳过spacing类型，但保留其文本内容到前一个单词
@@ -146,13 +151,15 @@ class SentenceSplitter:
                     # 将空格添加到前一个单词的文本中
                     if not current_group[-1]['text'].endswith(' '):
                         current_group[-1]['text'] += ' '
+                        current_chars += 1
                 continue
             
+            # 检查是否应该在此处分割
+            should_split = self._should_split_at_word(word, len(current_group), current_chars)
+            
             # 添加当前单词到组中
             current_group.append(word.copy())
-            
-            # 检查是否应该在此处分割
-            should_split = self._should_split_at_word(word, current_group[:-1])
+            current_chars += len(word.get('text', ''))
             
             # 如果是最后一个单词，强制分割
             is_last_word = (i == len(words) - 1)
@@ -161,6 +168,7 @@ class SentenceSplitter:
                 if current_group:
                     sentence_groups.append(current_group)
                     current_group = []
+                    current_chars = 0
         
         # 处理剩余的单词
         if current_group:
@@ -7,14 +7,17 @@ SRT字幕处理器模块
 """
 
 import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
 from .config import (
-    MIN_SUBTITLE_DURATION, MIN_SUBTITLE_GAP, CPS_SETTINGS, CPL_SETTINGS
+    MIN_SUBTITLE_DURATION, MIN_SUBTITLE_GAP, CPS_SETTINGS, CPL_SETTINGS, CJK_LANGUAGE_CODES
 )
 from .sentence_splitter import SentenceSplitter
 from .intelligent_merger import IntelligentMerger
 
+# 需要并入前一个单词的独立 CJK 标点
+_CJK_ATTACHED_PUNCT = frozenset("。？！」「、・，")
+
 
 def format_srt_time(seconds: float) -> str:
     """Convert seconds to SRT time format (HH:MM:SS,mmm)."""
@@ -40,7 +43,7 @@ class SrtProcessor:
                  subtitle_settings: Dict = None):
         self.srt_content = []
         self.line_number = 1
-        self.language = json_data.get("language_code", "eng")[:3] # e.g., "eng"
+        self.language = json_data.get("language_code", "eng")[:3].lower() # e.g., "eng"
         self.is_cjk = self._is_cjk_language()
 
         # 如果提供了高级设置，使用它们；否则使用默认值
@@ -70,7 +73,7 @@ class SrtProcessor:
 
     def _is_cjk_language(self) -> bool:
         """Check if the language is CJK (Chinese, Japanese, Korean)."""
-        return self.language in ["zho", "jpn", "kor", "chi", "zh", "ja", "ko"]
+        return self.language in CJK_LANGUAGE_CODES
 
     def _get_max_chars_for_language(self) -> int:
         """Returns the recommended max characters per line based on language."""
@@ -121,14 +124,15 @@ class SrtProcessor:
         self.audio_events = []  # 独立存储音频事件
 
         for word_info in raw_words:
+            word_type = word_info.get('type')
             # 首先检查是否为音频事件类型
-            if word_info.get('type') == 'audio_event':
+            if word_type == 'audio_event':
                 self.audio_events.append(word_info.copy())
                 continue
 
             # Skip spacing characters to fix timing issues with Latin text
             # But preserve the space character in the text of the previous word
-            if word_info.get('type') == 'spacing':
+            if word_type == 'spacing':
                 # Add space to the previous word if it exists and doesn't already end with space
                 if (self.words and
                     word_info.get('text', '').strip() == '' and  # Only for actual spaces
@@ -137,10 +141,10 @@ class SrtProcessor:
                     self.words[-1]['text'] += ' '
                 continue
 
-            is_cjk_punctuation = len(word_info['text']) == 1 and word_info['text'] in "。？！」「、・，"
+            is_cjk_punctuation = word_info['text'] in _CJK_ATTACHED_PUNCT
             if is_cjk_punctuation and self.words:
                 prev_word = self.words[-1]
-                if prev_word.get("type") == "word" and prev_word['text'] and prev_word['text'][-1] not in "。？！」「、・，":
+                if prev_word.get("type") == "word" and prev_word['text'] and prev_word['text'][-1] not in _CJK_ATTACHED_PUNCT:
                     prev_word['text'] += word_info['text']
                     prev_word['end'] = word_info['end']
                     continue
@@ -178,8 +182,15 @@ class SrtProcessor:
         3. Intelligent merging based on CPS, CPL, and display time rules
         4. Final integration and sorting
         """
+        return "".join(self.iter_srt())
+
+    def iter_srt(self) -> Iterator[str]:
+        """
+        Same as create_srt, but yields the SRT content block by block
+        so callers can stream it to a file without building the full string.
+        """
         if not self.words and not self.audio_events:
-            return ""
+            return
 
         # Stage 1: Sentence-level pre-splitting (only for word types)
         basic_entries = []
@@ -214,7 +225,7 @@ class SrtProcessor:
         all_entries.sort(key=lambda x: x['start'])  # 按时间顺序排序
 
         # Stage 5: Generate final SRT content with optimized display formatting
-        return self._generate_final_srt_content(all_entries)
+        yield from self._iter_final_srt_blocks(all_entries)
 
     def _generate_final_srt_content(self, entries: List[Dict]) -> str:
         """
@@ -226,11 +237,13 @@ class SrtProcessor:
         Returns:
             Final SRT content string
         """
-        if not entries:
-            return ""
-        
-        srt_lines = []
-        
+        return "".join(self._iter_final_srt_blocks(entries))
+
+    def _iter_final_srt_blocks(self, entries: List[Dict]) -> Iterator[str]:
+        """
+        Yield SRT entries one by one; entries after the first are prefixed
+        with the blank separator line.
+        """
         for i, entry in enumerate(entries, 1):
             # Format timing
             start_time_str = format_srt_time(entry['start'])
@@ -241,9 +254,7 @@ class SrtProcessor:
             
             # Generate SRT entry
             srt_entry = f"{i}\n{start_time_str} --> {end_time_str}\n{formatted_text}\n"
-            srt_lines.append(srt_entry)
-        
-        return "\n".join(srt_lines)
+            yield srt_entry if i == 1 else "\n" + srt_entry
     
     def _optimize_text_display(self, text: str) -> str:
         """
@@ -347,3 +358,13 @@ def create_srt_from_json(json_data: Dict, max_subtitle_duration: float = None,
     """
     processor = SrtProcessor(json_data, max_subtitle_duration, subtitle_settings)
     return processor.create_srt()
+
+
+def create_srt_from_json_iter(json_data: Dict, max_subtitle_duration: float = None,
+                              subtitle_settings: Dict = None) -> Iterator[str]:
+    """
+    Streaming variant of create_srt_from_json: yields SRT blocks instead of
+    returning the full content, e.g. for ``f.writelines(...)``.
+    """
+    processor = SrtProcessor(json_data, max_subtitle_duration, subtitle_settings)
+    return processor.iter_srt()
@@ -6,15 +6,40 @@
 
 import os
 import sys
-import json
+import math
 import subprocess
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Callable, Tuple
 
-from PySide6.QtCore import QObject, Signal, QThreadPool
+from PySide6.QtCore import QObject, Signal, Qt, QRunnable
 
 from api.client import ElevenLabsSTTClient
-from .srt_processor import create_srt_from_json
+from .srt_processor import create_srt_from_json_iter
+from .config import (
+    SEGMENT_COPY_CODEC_EXTENSIONS, CHECKPOINT_SCHEMA_VERSION, CHECKPOINT_MAX_AGE_SEC, VIDEO_EXTENSIONS
+)
+from .ffmpeg_utils import get_media_info
 from .async_chunk_processor import AsyncChunkProcessor
+from .json_utils import load_json, write_json_atomic
+
+# 无法流复制时重新编码片段使用的参数
+MP3_ENCODE_ARGS = ["-c:a", "libmp3lame", "-b:a", "192k"]
+# 等待单个 FFmpeg 切片进程时检查取消请求的间隔（秒）
+FFMPEG_CANCEL_POLL_SEC = 0.2
+
+
+def _remove_file(path: str) -> Tuple[bool, Optional[str]]:
+    """删除文件，返回 (是否删除了文件, 错误信息)；文件不存在不视为错误。"""
+    try:
+        os.remove(path)
+        return True, None
+    except FileNotFoundError:
+        return False, None
+    except OSError as e:
+        return False, f"{os.path.basename(path)}: {e}"
+
 
 class Worker(QObject):
     """
@@ -43,12 +68,24 @@ class Worker(QObject):
         self.ffmpeg_available = ffmpeg_available
         self.restore_state = restore_state
         self.subtitle_settings = subtitle_settings
+        # 调试模式：单文件模式也写出分段JSON，且任务完成后保留所有分段JSON
+        self._debug_chunks = bool(os.environ.get("SCRIBE2SRT_DEBUG_CHUNKS")) or bool((subtitle_settings or {}).get("debug_chunks"))
+
+        # 保护取消标志的检查与检查点的写入/删除：界面线程的取消与工作线程的保存不会交错，
+        # 已删除的检查点不会被正在进行的保存重新写出
+        self._checkpoint_lock = threading.Lock()
+
+        # 调用方没有传入恢复状态时，尝试从磁盘上的检查点恢复（如程序崩溃后重新打开同一文件）
+        self._restored_from_checkpoint = False
+        if self.restore_state is None:
+            self.restore_state = self._load_checkpoint()
+            self._restored_from_checkpoint = self.restore_state is not None
         
-        self.uploader = None
         self.client = ElevenLabsSTTClient(signals_forwarder=self, ffmpeg_available=self.ffmpeg_available)
 
-        # 异步片段处理器
+        # 异步片段处理器及其已连接的 (信号, 槽) 列表
         self.async_processor = None
+        self._async_connections: List[Tuple[Any, Callable]] = []
         # 从恢复状态或使用传入参数配置异步处理
         if self.restore_state:
             self.enable_async_processing = self.restore_state.get("enable_async_processing", enable_async_processing)
@@ -63,23 +100,34 @@ class Worker(QObject):
 
         self._is_cancelled = False
         
+        # 按片段索引存储的原始转录结果，时间偏移只在 _finalize_task 合并时统一应用一次
+        self._chunk_transcripts: Dict[int, dict] = {}
+        self.combined_transcript = {}
+        # 异步处理器内的局部索引到全局片段索引的映射，以及日志前缀（恢复模式下为"恢复模式："）
+        self._chunk_index_map: List[int] = []
+        self._log_prefix = ""
+        # 分段 JSON 在后台写盘，不阻塞下一个片段的处理
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="worker-io")
+        # 任务出错结束时同样关闭 I/O 线程池（成功时由 _finalize_task 关闭）
+        self.error.connect(self._shutdown_io_pool)
+        # ffprobe 结果按文件路径缓存，同一文件在一次任务中只探测一次
+        self._media_info_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+
         if self.restore_state:
             self.temp_chunks = self.restore_state.get("temp_chunks", [])
             self.owned_temp_chunks = self.restore_state.get("owned_temp_chunks", [])
-            self.combined_transcript = self.restore_state.get("combined_transcript", {})
+            for chunk_index, transcript_json in self.restore_state.get("chunk_transcripts", {}).items():
+                self._record_chunk(chunk_index, transcript_json)
             self.current_chunk_index = self.restore_state.get("current_chunk_index", 0)
             self.total_chunks = self.restore_state.get("total_chunks", 0)
-            self.time_offset = self.restore_state.get("time_offset", 0.0)
             # 恢复处理模式信息
             self.was_single_file_mode = self.restore_state.get("was_single_file_mode", False)
             self.extracted_audio_file = self.restore_state.get("extracted_audio_file", None)
         else:
             self.temp_chunks = []
             self.owned_temp_chunks = []
-            self.combined_transcript = {}
             self.current_chunk_index = 0
             self.total_chunks = 0
-            self.time_offset = 0.0
             self.was_single_file_mode = False
             self.extracted_audio_file = None
 
@@ -94,10 +142,9 @@ class Worker(QObject):
             "file_path": self.file_path,  # 添加 file_path 到状态中
             "temp_chunks": self.temp_chunks,
             "owned_temp_chunks": self.owned_temp_chunks,
-            "combined_transcript": self.combined_transcript,
+            "chunk_transcripts": dict(self._chunk_transcripts),
             "current_chunk_index": self.current_chunk_index,
             "total_chunks": self.total_chunks,
-            "time_offset": self.time_offset,
             "original_file_path": self.original_file_path,
             "language_code": self.language_code,
             "tag_audio_events": self.tag_audio_events,
@@ -115,15 +162,108 @@ class Worker(QObject):
             "extracted_audio_file": getattr(self, 'extracted_audio_file', None),
         }
 
+    def _checkpoint_path(self) -> str:
+        """检查点文件路径：与原始文件同目录同名，扩展名为 .ckpt.json。"""
+        return os.path.splitext(self.original_file_path)[0] + ".ckpt.json"
+
+    def _save_checkpoint(self):
+        """将当前状态原子写入检查点文件。
+
+        转录结果已作为分段 JSON 保存在各片段旁，检查点只记录已完成的片段索引。
+        检查点同时记录原始文件的大小和修改时间，恢复时据此确认仍是同一个源文件。
+        任务取消后不再写入，以免被取消的任务在下次打开同一文件时被自动恢复。
+        """
+        state = self.get_state()
+        state.pop("chunk_transcripts")
+        state.pop("async_progress")
+        state["completed_chunks"] = sorted(self._chunk_transcripts)
+        state["schema_version"] = CHECKPOINT_SCHEMA_VERSION
+        state["timestamp"] = time.time()
+        try:
+            source_stat = os.stat(self.original_file_path)
+        except OSError as e:
+            self.log_message.emit(f"保存检查点失败: {e}")
+            return
+        state["source_size"] = source_stat.st_size
+        state["source_mtime_ns"] = source_stat.st_mtime_ns
+        with self._checkpoint_lock:
+            if self._is_cancelled:
+                return
+            try:
+                write_json_atomic(self._checkpoint_path(), state)
+            except OSError as e:
+                self.log_message.emit(f"保存检查点失败: {e}")
+
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """读取检查点并还原为恢复状态；检查点无效、过期、与当前设置不符或不属于当前源文件时返回 None。
+
+        同目录下同名不同扩展名的文件（如 a.mp3 与 a.mp4）共用一个检查点路径，
+        因此还要核对检查点记录的原始文件路径、大小和修改时间。
+        """
+        path = self._checkpoint_path()
+        try:
+            state = load_json(path)
+            source_stat = os.stat(self.original_file_path)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(state, dict):
+            return None
+        checkpoint_source = state.get("original_file_path")
+        if not checkpoint_source or os.path.abspath(checkpoint_source) != os.path.abspath(self.original_file_path):
+            # 属于同名的其他文件，保留给那个文件使用
+            return None
+        if (state.get("source_size") != source_stat.st_size
+                or state.get("source_mtime_ns") != source_stat.st_mtime_ns
+                or state.get("schema_version") != CHECKPOINT_SCHEMA_VERSION
+                or time.time() - state.get("timestamp", 0) > CHECKPOINT_MAX_AGE_SEC
+                or state.get("language_code") != self.language_code
+                or state.get("tag_audio_events") != self.tag_audio_events
+                or state.get("split_duration_min") != self.split_duration_sec / 60):
+            self._remove_checkpoint()
+            return None
+
+        # 从分段 JSON 读回已完成片段的转录结果，读取失败的片段会被重新处理
+        chunk_transcripts = {}
+        temp_chunks = state.get("temp_chunks", [])
+        for chunk_index in state.get("completed_chunks", []):
+            if 0 <= chunk_index < len(temp_chunks):
+                try:
+                    chunk_transcripts[chunk_index] = load_json(os.path.splitext(temp_chunks[chunk_index])[0] + ".json")
+                except (OSError, ValueError):
+                    pass
+        state["chunk_transcripts"] = chunk_transcripts
+        return state
+
+    def _remove_checkpoint(self):
+        """任务完成或取消后删除检查点文件。"""
+        with self._checkpoint_lock:
+            try:
+                os.remove(self._checkpoint_path())
+            except OSError:
+                pass
+
     def run(self):
         """任务执行的入口点。"""
         is_restoring = self.restore_state and self.restore_state.get("temp_chunks")
 
         if is_restoring:
+            if self._restored_from_checkpoint:
+                self.log_message.emit(
+                    f"检测到未完成任务的检查点 {os.path.basename(self._checkpoint_path())}，"
+                    f"将自动从断点恢复（已完成 {len(self._chunk_transcripts)}/{self.total_chunks} 个片段）。"
+                    "如需重新开始，请删除该检查点文件。")
             self.log_message.emit("...从断点处恢复任务...")
+            if self._restored_from_checkpoint and self.total_chunks > 1:
+                # 界面按新任务启动时设置的是单文件进度条，这里按检查点中的片段重新设置，并标记已完成的片段
+                self.chunks_ready.emit(self.temp_chunks)
+                for chunk_index in self._chunk_transcripts:
+                    self.chunk_progress.emit(chunk_index, "completed", "")
 
-            # 检查临时文件是否存在
-            missing_files = [p for p in self.temp_chunks if not os.path.exists(p)]
+            # 检查临时文件是否存在（已完成转录的片段不再需要音频文件）
+            pending_chunks = [p for i, p in enumerate(self.temp_chunks) if i not in self._chunk_transcripts]
+            existing_files = self._existing_files(pending_chunks)
+            missing_files = [p for p in pending_chunks if p not in existing_files]
 
             if missing_files:
                 if self.was_single_file_mode:
@@ -135,14 +275,13 @@ class Worker(QObject):
 
                     # 检查是否需要从视频提取音频
                     _, ext = os.path.splitext(original_file)
-                    video_extensions = ['.mp4', '.mkv', '.mov', '.avi', '.flv', '.webm']
 
-                    if ext.lower() in video_extensions and self.ffmpeg_available:
+                    if ext.lower() in VIDEO_EXTENSIONS and self.ffmpeg_available:
                         # 重新提取音频
-                        from core.ffmpeg_utils import get_media_info, extract_audio
+                        from core.ffmpeg_utils import extract_audio
                         from ui.main_window import CODEC_EXTENSION_MAP, DEFAULT_AUDIO_EXTENSION
 
-                        media_info = get_media_info(original_file)
+                        media_info = self._get_media_info(original_file)
                         codec = media_info.get("codec") if media_info else None
                         extension = CODEC_EXTENSION_MAP.get(codec, DEFAULT_AUDIO_EXTENSION) if codec else DEFAULT_AUDIO_EXTENSION
 
@@ -163,11 +302,16 @@ class Worker(QObject):
                         self.temp_chunks = [original_file]
                         self.log_message.emit("使用原始音频文件继续处理")
                 else:
-                    # 多片段模式：重新切分音频
-                    self.log_message.emit("检测到临时切片文件丢失，正在重新切分...")
-                    if not self._split_audio(self.restore_state.get("original_file_path", self.original_file_path)):
-                         self.error.emit("恢复任务失败：无法重新切分音频。")
-                         return
+                    source_file = self.restore_state.get("original_file_path", self.original_file_path)
+                    missing_indices = [self.temp_chunks.index(p) for p in missing_files]
+                    # 丢失的片段不多时只补切这些片段，否则整体重新切分
+                    resplit_ok = (len(missing_indices) <= len(self.temp_chunks) / 2
+                                  and self._resplit_missing_chunks(source_file, missing_indices))
+                    if not resplit_ok:
+                        self.log_message.emit("检测到临时切片文件丢失，正在重新切分...")
+                        if not self._split_audio(source_file):
+                             self.error.emit("恢复任务失败：无法重新切分音频。")
+                             return
 
             # 恢复模式下的处理逻辑
             self._process_restored_chunks()
@@ -177,11 +321,12 @@ class Worker(QObject):
         self.log_message.emit(f"开始处理文件: {os.path.basename(self.original_file_path)}")
 
         media_info = self.client.log_media_info(self.file_path)
+        self._media_info_cache[self.file_path] = media_info
         duration = media_info.get("duration") if media_info else 0
 
         if duration > self.split_duration_sec and self.ffmpeg_available:
             self.log_message.emit(f"文件时长超过 {self.split_duration_sec / 60:.0f} 分钟，将执行自动切分。")
-            if self._split_audio(self.file_path):
+            if self._split_audio(self.file_path, media_info):
                 self._process_next_chunk()
             else:
                 return
@@ -196,35 +341,62 @@ class Worker(QObject):
                 self.extracted_audio_file = self.file_path
             self._process_next_chunk()
 
-    def _split_audio(self, audio_path: str) -> bool:
-        """使用 FFmpeg 切分音频文件。"""
+    def _get_media_info(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """返回文件的 ffprobe 结果，已探测过的文件直接使用缓存。"""
+        if file_path not in self._media_info_cache:
+            self._media_info_cache[file_path] = get_media_info(file_path)
+        return self._media_info_cache[file_path]
+
+    def _split_audio(self, audio_path: str, media_info: Optional[Dict[str, Any]] = None) -> bool:
+        """使用 FFmpeg 切分音频文件。
+
+        源文件已是 mp3/aac/opus 时直接流复制切分，不重新编码；
+        其他编码或流复制失败时回退到 libmp3lame 重新编码，时长已知时按片段并行编码。
+        media_info 为调用方已获取的 ffprobe 结果，未提供时通过 _get_media_info 获取。
+        """
         self.log_message.emit("正在切分音频文件...")
         self.chunk_progress.emit(-1, "splitting", "正在切分音频...")
         
         base_dir = os.path.dirname(audio_path)
         base_name, _ = os.path.splitext(os.path.basename(audio_path))
-        
-        output_template = os.path.join(base_dir, f"{base_name}_chunk_%03d.mp3")
+
+        if media_info is None:
+            media_info = self._get_media_info(audio_path)
+        codec = media_info.get("codec") if media_info else None
+        duration = media_info.get("duration") if media_info else 0
+
+        copy_extension = SEGMENT_COPY_CODEC_EXTENSIONS.get(codec)
         
         try:
-            startupinfo = None
-            if sys.platform == "win32":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-            command = [
-                "ffmpeg", "-i", audio_path,
-                "-f", "segment",
-                "-segment_time", str(self.split_duration_sec),
-                "-c:a", "libmp3lame",
-                "-b:a", "192k",
-                "-y",
-                output_template
-            ]
-            
-            subprocess.run(command, check=True, capture_output=True, text=True, encoding='utf-8', startupinfo=startupinfo)
-            
-            self.owned_temp_chunks = sorted([os.path.join(base_dir, f) for f in os.listdir(base_dir) if f.startswith(f"{base_name}_chunk_") and f.endswith(".mp3")])
+            chunks = None
+            if copy_extension:
+                self.log_message.emit(f"音频编码为 {codec}，使用流复制切分。")
+                output_template = os.path.join(base_dir, f"{base_name}_chunk_%03d{copy_extension}")
+                try:
+                    self._run_segmenter(audio_path, ["-vn", "-c:a", "copy"], output_template, duration)
+                    chunks = self._collect_segments(output_template)
+                except subprocess.CalledProcessError as e:
+                    self._remove_segments(output_template)
+                    self.log_message.emit(f"流复制切分失败，改为重新编码: {e.stderr.strip() if e.stderr else e}")
+
+            if not chunks:
+                output_template = os.path.join(base_dir, f"{base_name}_chunk_%03d.mp3")
+                chunk_count = math.ceil(duration / self.split_duration_sec - 1e-3) if duration else 0
+                if chunk_count > 1 and (os.cpu_count() or 1) > 1:
+                    try:
+                        chunks = self._encode_segments_parallel(audio_path, output_template, chunk_count)
+                    except (subprocess.CalledProcessError, RuntimeError) as e:
+                        if self._is_cancelled:
+                            raise
+                        # 并行编码失败（如 ffprobe 时长与实际不符导致片段缺失）时，
+                        # 部分片段已被删除，改用单个 segment 进程按实际音频切分
+                        self.log_message.emit(f"并行编码失败，改用顺序切分: {e.stderr.strip() if getattr(e, 'stderr', None) else e}")
+                        chunks = None
+                if not chunks:
+                    self._run_segmenter(audio_path, MP3_ENCODE_ARGS, output_template, duration)
+                    chunks = self._collect_segments(output_template)
+
+            self.owned_temp_chunks = chunks
             self.temp_chunks = self.owned_temp_chunks
 
             if not self.owned_temp_chunks:
@@ -237,12 +409,228 @@ class Worker(QObject):
             return True
 
         except (subprocess.CalledProcessError, FileNotFoundError, RuntimeError) as e:
+            if self._is_cancelled:
+                self._remove_segments(output_template)
+                self.error.emit("任务被用户取消。")
+                return False
             error_message = f"音频切分失败: {e}"
             if hasattr(e, 'stderr'):
                 error_message += f"\nFFmpeg 输出:\n{e.stderr.strip()}"
             self.error.emit(error_message)
             return False
 
+    def _run_segmenter(self, audio_path: str, codec_args: List[str], output_template: str, duration: float = 0):
+        """以给定的编码参数运行 FFmpeg segment 切分。
+
+        通过 -progress 输出解析切分进度，期间响应取消请求；
+        FFmpeg 只输出错误级别日志，stderr 由后台线程持续读取，避免管道写满导致 FFmpeg 阻塞。
+        """
+        startupinfo = None
+        if sys.platform == "win32":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+        command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-i", audio_path,
+            *codec_args,
+            "-f", "segment",
+            "-segment_time", str(self.split_duration_sec),
+            "-reset_timestamps", "1",
+            "-progress", "pipe:1", "-nostats",
+            "-y",
+            output_template
+        ]
+
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+            bufsize=1 << 20, text=True, encoding='utf-8', errors='replace', startupinfo=startupinfo
+        )
+        stderr_lines: List[str] = []
+        stderr_reader = threading.Thread(target=lambda: stderr_lines.extend(process.stderr), daemon=True)
+        stderr_reader.start()
+
+        last_reported = 0
+        for line in process.stdout:
+            if self._is_cancelled:
+                process.terminate()
+                break
+            key, _, value = line.strip().partition("=")
+            # out_time_ms 实际单位也是微秒
+            if key in ("out_time_us", "out_time_ms") and duration > 0 and value.isdigit():
+                percent = min(100, int(int(value) / 1_000_000 / duration * 100))
+                # 每 10% 报告一次，避免刷屏
+                if percent >= last_reported + 10:
+                    last_reported = percent - percent % 10
+                    self.chunk_progress.emit(-1, "splitting", f"正在切分音频... {last_reported}%")
+
+        returncode = process.wait()
+        stderr_reader.join()
+
+        if self._is_cancelled:
+            raise RuntimeError("任务被用户取消。")
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command, stderr="".join(stderr_lines))
+
+    def _encode_segments_parallel(self, audio_path: str, output_template: str, chunk_count: int) -> List[str]:
+        """按时间范围为每个片段单独启动 FFmpeg 重新编码，多个进程并行执行。
+
+        libmp3lame 是单线程编码器，单个 segment 进程只能用满一个核心；
+        各片段互不依赖，按 CPU 核数并行可以成倍缩短重新编码的耗时。
+        """
+        chunk_paths = [output_template % i for i in range(chunk_count)]
+        max_workers = min(os.cpu_count() or 1, chunk_count)
+        self.log_message.emit(f"使用 {max_workers} 个 FFmpeg 进程并行编码 {chunk_count} 个片段。")
+
+        # 任一片段失败时通知其余正在运行的 FFmpeg 进程退出
+        abort = threading.Event()
+
+        def encode(chunk_index: int):
+            if self._is_cancelled or abort.is_set():
+                raise RuntimeError("任务被用户取消。")
+            # 最后一个片段不限制时长，ffprobe 报告的时长偏短时结尾的音频也不会丢失
+            self._cut_chunk(audio_path, chunk_index, chunk_paths[chunk_index], MP3_ENCODE_ARGS,
+                            open_ended=chunk_index == chunk_count - 1, abort=abort)
+
+        last_reported = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ffmpeg-encode") as executor:
+                futures = [executor.submit(encode, i) for i in range(chunk_count)]
+                try:
+                    for done, future in enumerate(as_completed(futures), 1):
+                        future.result()
+                        percent = done * 100 // chunk_count
+                        # 每 10% 报告一次，与 _run_segmenter 保持一致
+                        if percent >= last_reported + 10 and percent < 100:
+                            last_reported = percent - percent % 10
+                            self.chunk_progress.emit(-1, "splitting", f"正在切分音频... {last_reported}%")
+                except BaseException:
+                    abort.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+            # 取消请求可能在最后几个片段编码期间到达
+            if self._is_cancelled:
+                raise RuntimeError("任务被用户取消。")
+        except BaseException:
+            # 不留下部分编码的片段
+            for chunk_path in chunk_paths:
+                _remove_file(chunk_path)
+            raise
+        return chunk_paths
+
+    def _cut_chunk(self, source_file: str, chunk_index: int, chunk_path: str, codec_args: List[str],
+                   open_ended: bool = False, abort: Optional[threading.Event] = None):
+        """从源文件中切出第 chunk_index 个片段，即 [i * 切分时长, (i + 1) * 切分时长)。
+
+        open_ended 为 True 时（最后一个片段）不限制时长，一直切到源文件结尾。
+        -ss 放在 -i 之前以快速定位；等待期间响应取消请求和 abort 事件，并结束 FFmpeg 进程。
+        失败时抛出 CalledProcessError、FileNotFoundError，取消或未生成有效片段时抛出 RuntimeError。
+        """
+        startupinfo = None
+        if sys.platform == "win32":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+        command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-ss", str(chunk_index * self.split_duration_sec),
+            *([] if open_ended else ["-t", str(self.split_duration_sec)]),
+            "-i", source_file,
+            "-vn", *codec_args,
+            "-y", chunk_path
+        ]
+        process = subprocess.Popen(
+            command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+            text=True, encoding='utf-8', errors='replace', startupinfo=startupinfo
+        )
+        while True:
+            try:
+                _, stderr = process.communicate(timeout=FFMPEG_CANCEL_POLL_SEC)
+                break
+            except subprocess.TimeoutExpired:
+                if self._is_cancelled or (abort is not None and abort.is_set()):
+                    process.kill()
+                    process.communicate()
+                    raise RuntimeError("任务被用户取消。")
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr)
+        try:
+            chunk_size = os.path.getsize(chunk_path)
+        except OSError:
+            chunk_size = 0
+        if chunk_size == 0:
+            raise RuntimeError(f"FFmpeg 未生成有效的片段 {chunk_index + 1}: {os.path.basename(chunk_path)}")
+
+    def _resplit_missing_chunks(self, source_file: str, missing_indices: List[int]) -> bool:
+        """按片段时间范围只重新切出丢失的片段。
+
+        片段按固定时长切分，第 i 个片段即 [i * 切分时长, (i + 1) * 切分时长)。
+        片段扩展名与源编码对应时流复制，.mp3 片段否则重新编码；其余情况返回 False，由调用方整体重新切分。
+        """
+        if not os.path.exists(source_file):
+            return False
+
+        media_info = self._get_media_info(source_file)
+        codec = media_info.get("codec") if media_info else None
+
+        self.log_message.emit(f"检测到 {len(missing_indices)} 个临时切片文件丢失，正在补切...")
+        for chunk_index in missing_indices:
+            chunk_path = self.temp_chunks[chunk_index]
+            extension = os.path.splitext(chunk_path)[1].lower()
+            if SEGMENT_COPY_CODEC_EXTENSIONS.get(codec) == extension:
+                codec_args = ["-c:a", "copy"]
+            elif extension == ".mp3":
+                codec_args = MP3_ENCODE_ARGS
+            else:
+                return False
+
+            try:
+                self._cut_chunk(source_file, chunk_index, chunk_path, codec_args,
+                                open_ended=chunk_index == len(self.temp_chunks) - 1)
+            except (subprocess.CalledProcessError, FileNotFoundError, RuntimeError) as e:
+                _remove_file(chunk_path)
+                self.log_message.emit(f"补切片段 {chunk_index + 1} 失败: {e}")
+                return False
+            self.log_message.emit(f"已补切片段 {chunk_index + 1}/{len(self.temp_chunks)}")
+
+        return True
+
+    @staticmethod
+    def _existing_files(paths: List[str]) -> set:
+        """返回 paths 中实际存在的文件；每个所在目录只枚举一次，代替逐个 stat。"""
+        paths_by_dir: Dict[str, List[str]] = {}
+        for path in paths:
+            paths_by_dir.setdefault(os.path.dirname(path), []).append(path)
+
+        existing = set()
+        for directory, dir_paths in paths_by_dir.items():
+            try:
+                with os.scandir(directory or ".") as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                continue
+            existing.update(p for p in dir_paths if os.path.basename(p) in names)
+        return existing
+
+    @staticmethod
+    def _collect_segments(output_template: str) -> List[str]:
+        """按 %03d 序号依次生成片段路径，直到遇到第一个不存在的文件，无需扫描整个目录。"""
+        chunks = []
+        while os.path.exists(output_template % len(chunks)):
+            chunks.append(output_template % len(chunks))
+        return chunks
+
+    def _remove_segments(self, output_template: str):
+        """删除流复制失败时留下的部分片段。"""
+        for chunk_path in self._collect_segments(output_template):
+            try:
+                os.remove(chunk_path)
+            except OSError:
+                pass
+
     def _process_next_chunk(self):
         """处理下一个待处理的音频片段。"""
         if self._is_cancelled:
@@ -250,153 +638,151 @@ class Worker(QObject):
             self._cleanup_chunks(force_cleanup=True)  # 用户取消时强制清理
             return
 
-        # 检查是否使用异步处理
-        if self.enable_async_processing and self.total_chunks > 1:
-            self._process_chunks_async()
+        # 单文件和多片段统一走异步处理器，单文件或关闭并发时并发数为 1
+        self.log_message.emit("-" * 20)
+        if self.total_chunks > 1:
+            self.log_message.emit(f"启用异步处理模式，并发数 {self._concurrency_for(self.total_chunks)}，共 {self.total_chunks} 个片段...")
+            self.chunk_progress.emit(-1, "async_start", f"异步处理 {self.total_chunks} 个片段")
         else:
-            # 使用原有的顺序处理逻辑（兼容性保证）
-            self._process_chunks_sequential()
+            self.log_message.emit(f"正在处理文件: {os.path.basename(self.temp_chunks[0])}")
+        self._start_async(list(range(self.total_chunks)))
 
-    def _process_chunks_async(self):
-        """异步处理所有音频片段"""
-        self.log_message.emit("-" * 20)
-        self.log_message.emit(f"启用异步处理模式，并发处理 {self.total_chunks} 个片段...")
-        self.chunk_progress.emit(-1, "async_start", f"异步处理 {self.total_chunks} 个片段")
+    def _concurrency_for(self, chunk_count: int) -> int:
+        """单个片段或关闭并发处理时以并发数 1 运行，等价于原来的顺序处理。"""
+        if not self.enable_async_processing or chunk_count <= 1:
+            return 1
+        return self.max_concurrent_chunks
 
-        # 创建异步处理器
-        self.async_processor = AsyncChunkProcessor(
-            max_concurrent_chunks=self.max_concurrent_chunks,
-            max_retries=self.max_retries
-        )
-        # 设置API速率限制
-        self.async_processor.max_requests_per_minute = self.api_rate_limit_per_minute
+    def _start_async(self, chunk_indices: List[int], restored: bool = False):
+        """用新的异步处理器处理指定的片段。
 
-        # 连接信号
-        self.async_processor.chunk_started.connect(self._on_async_chunk_started)
-        self.async_processor.chunk_completed.connect(self._on_async_chunk_completed)
-        self.async_processor.chunk_failed.connect(self._on_async_chunk_failed)
-        self.async_processor.all_chunks_completed.connect(self._on_async_all_completed)
-        self.async_processor.processing_failed.connect(self._on_async_processing_failed)
-        self.async_processor.progress_updated.connect(self._on_async_progress_updated)
+        Args:
+            chunk_indices: 要处理的全局片段索引，处理器回调中的局部索引据此映射回全局索引
+            restored: 是否为从断点恢复后继续处理剩余片段，仅影响日志文字
+        """
+        self._chunk_index_map = chunk_indices
+        self._log_prefix = "恢复模式：" if restored else ""
+
+        # 创建异步处理器并连接信号
+        self._create_async_processor(self._concurrency_for(len(chunk_indices)))
+        processor = self.async_processor
+        self._connect_async([
+            (processor.chunk_started, self._on_async_chunk_started),
+            (processor.chunk_completed, self._on_async_chunk_completed),
+            (processor.chunk_failed, self._on_async_chunk_failed),
+            (processor.all_chunks_completed, self._on_async_all_completed),
+            (processor.processing_failed, self._on_async_processing_failed),
+            (processor.progress_updated, self._on_async_progress_updated),
+        ])
 
         # 启动异步处理
-        success = self.async_processor.process_chunks_async(
-            chunk_paths=self.temp_chunks,
-            split_duration_sec=self.split_duration_sec,
+        success = processor.process_chunks_async(
+            chunk_paths=[self.temp_chunks[i] for i in chunk_indices],
             language_code=self.language_code,
             tag_audio_events=self.tag_audio_events,
             ffmpeg_available=self.ffmpeg_available,
-            log_callback=lambda msg: self.log_message.emit(msg)
+            log_callback=lambda msg: self.log_message.emit(msg),
+            chunk_numbers=[i + 1 for i in chunk_indices]
         )
 
         if not success:
-            self.error.emit("启动异步处理失败")
+            self.error.emit(f"{self._log_prefix}启动异步处理失败")
 
-    def _process_chunks_sequential(self):
-        """顺序处理音频片段（原有逻辑）"""
-        if self.current_chunk_index < self.total_chunks:
-            self.time_offset = self.current_chunk_index * self.split_duration_sec
-            chunk_path = self.temp_chunks[self.current_chunk_index]
+    def _create_async_processor(self, max_concurrent: int):
+        """创建新的异步处理器并配置API速率限制。
 
-            self.log_message.emit("-" * 20)
-            self.log_message.emit(f"正在处理片段 {self.current_chunk_index + 1}/{self.total_chunks}: {os.path.basename(chunk_path)}")
-            self.chunk_progress.emit(self.current_chunk_index, "processing", f"正在处理片段 {self.current_chunk_index + 1}/{self.total_chunks}")
+        速率限制由处理器内的所有并发片段共享（按最小请求间隔统一排队），
+        因此直接使用用户设置的每分钟请求数，无需再按并发数折算。
+        替换旧处理器时沿用其速率限制进度，避免降级后立即连续发出请求。
+        """
+        previous = self.async_processor
+        self._disconnect_async()
+        self.async_processor = AsyncChunkProcessor(
+            max_concurrent_chunks=max_concurrent,
+            max_retries=self.max_retries
+        )
+        self.async_processor.max_requests_per_minute = self.api_rate_limit_per_minute
+        if previous:
+            self.async_processor.next_request_time = previous.next_request_time
+        self.log_message.emit(
+            f"API速率限制: 每分钟最多 {self.api_rate_limit_per_minute} 次请求"
+            f"（{max_concurrent} 个并发共享，请求间隔至少 {60 / max(1, self.api_rate_limit_per_minute):.1f} 秒）"
+        )
 
-            self._process_single_file(chunk_path)
-        else:
-            self._finalize_task()
+    def _connect_async(self, connections: List[Tuple[Any, Callable]]):
+        """以 UniqueConnection 连接异步处理器信号，并记录下来以便替换处理器时断开。"""
+        for signal, slot in connections:
+            signal.connect(slot, Qt.UniqueConnection)
+        self._async_connections = connections
+
+    def _disconnect_async(self):
+        """断开当前异步处理器的所有信号连接，避免旧处理器的回调继续触发。"""
+        for signal, slot in self._async_connections:
+            try:
+                signal.disconnect(slot)
+            except RuntimeError:
+                pass
+        self._async_connections = []
 
     def _process_restored_chunks(self):
         """处理恢复的任务"""
         # 计算剩余需要处理的片段
-        remaining_chunks = self.temp_chunks[self.current_chunk_index:]
+        remaining_indices = [i for i in range(len(self.temp_chunks)) if i not in self._chunk_transcripts]
 
-        if not remaining_chunks:
+        if not remaining_indices:
             # 所有片段都已完成，直接进入最终处理
             self.log_message.emit("所有片段已在之前完成，直接生成最终文件...")
             self._finalize_task()
             return
 
-        self.log_message.emit(f"需要继续处理 {len(remaining_chunks)} 个剩余片段...")
+        self.log_message.emit(f"需要继续处理 {len(remaining_indices)} 个剩余片段...")
+        self._process_remaining_chunks(remaining_indices)
 
-        # 根据剩余片段数量选择处理模式
-        if self.enable_async_processing and len(remaining_chunks) > 1:
-            # 异步处理剩余片段
-            self._process_remaining_chunks_async(remaining_chunks)
-        else:
-            # 顺序处理剩余片段
-            self._process_chunks_sequential()
+    def _process_remaining_chunks(self, remaining_indices: List[int], restored: bool = True):
+        """异步处理剩余的音频片段
 
-    def _process_remaining_chunks_async(self, remaining_chunks: List[str]):
-        """异步处理剩余的音频片段"""
+        Args:
+            remaining_indices: 剩余片段的全局索引
+            restored: 是否为从断点恢复的任务；降级处理时为 False，日志中不显示"恢复模式"
+        """
         self.log_message.emit("-" * 20)
-        self.log_message.emit(f"恢复模式：异步处理剩余 {len(remaining_chunks)} 个片段...")
-        self.chunk_progress.emit(-1, "async_restore", f"恢复异步处理 {len(remaining_chunks)} 个片段")
-
-        # 创建异步处理器
-        self.async_processor = AsyncChunkProcessor(
-            max_concurrent_chunks=self.max_concurrent_chunks,
-            max_retries=self.max_retries
-        )
-        # 设置API速率限制
-        self.async_processor.max_requests_per_minute = self.api_rate_limit_per_minute
-
-        # 连接信号
-        self.async_processor.chunk_started.connect(self._on_async_chunk_started_restored)
-        self.async_processor.chunk_completed.connect(self._on_async_chunk_completed_restored)
-        self.async_processor.chunk_failed.connect(self._on_async_chunk_failed)
-        self.async_processor.all_chunks_completed.connect(self._on_async_all_completed_restored)
-        self.async_processor.processing_failed.connect(self._on_async_processing_failed)
-        self.async_processor.progress_updated.connect(self._on_async_progress_updated_restored)
-
-        # 启动异步处理剩余片段
-        success = self.async_processor.process_chunks_async(
-            chunk_paths=remaining_chunks,
-            split_duration_sec=self.split_duration_sec,
-            language_code=self.language_code,
-            tag_audio_events=self.tag_audio_events,
-            ffmpeg_available=self.ffmpeg_available,
-            log_callback=lambda msg: self.log_message.emit(msg)
-        )
-
-        if not success:
-            self.error.emit("恢复模式：启动异步处理失败")
-
-    def _process_single_file(self, file_path: str):
-        """为单个文件准备并开始上传任务。"""
-        self.uploader = self.client.prepare_upload_task(
-            file_path, self.language_code, self.tag_audio_events
-        )
-        if not self.uploader:
-            self.error.emit(f"为文件 {os.path.basename(file_path)} 准备任务失败。")
-            return
-
-        self.uploader.signals.progress.connect(self.progress_updated)
-        self.uploader.signals.finished.connect(self.on_upload_finished)
-        self.uploader.signals.error.connect(self.on_chunk_error)
-        
-        QThreadPool.globalInstance().start(self.uploader)
+        if restored:
+            self.log_message.emit(f"恢复模式：异步处理剩余 {len(remaining_indices)} 个片段...")
+            self.chunk_progress.emit(-1, "async_restore", f"恢复异步处理 {len(remaining_indices)} 个片段")
+        self._start_async(remaining_indices, restored=restored)
 
     # === 异步处理信号回调方法 ===
+    # 处理器回调中的片段索引是局部索引，需通过 _chunk_index_map 映射为全局片段索引
     def _on_async_chunk_started(self, chunk_index: int):
         """异步片段开始处理回调"""
-        self.log_message.emit(f"开始异步处理片段 {chunk_index + 1}/{self.total_chunks}")
+        chunk_index = self._chunk_index_map[chunk_index]
+        self.log_message.emit(f"{self._log_prefix}开始异步处理片段 {chunk_index + 1}/{self.total_chunks}")
         self.chunk_progress.emit(chunk_index, "started", f"开始处理片段 {chunk_index + 1}/{self.total_chunks}")
 
     def _on_async_chunk_completed(self, chunk_index: int, transcript_json: dict):
         """异步片段完成回调"""
-        self.log_message.emit(f"片段 {chunk_index + 1}/{self.total_chunks} 异步转录成功")
+        # 取消后仍可能收到已排队或迟到的完成信号，此时不再记录结果或写检查点
+        if self._is_cancelled:
+            return
+        chunk_index = self._chunk_index_map[chunk_index]
+        self._record_chunk(chunk_index, transcript_json)
+        # 多片段时分段JSON同时是检查点的数据来源；单文件完成后立即生成最终文件，无需分段JSON和检查点
+        if self.total_chunks > 1 or self._debug_chunks:
+            self._save_chunk_json(chunk_index, transcript_json)
+        if self.total_chunks > 1:
+            self._save_checkpoint()
+        self.log_message.emit(f"{self._log_prefix}片段 {chunk_index + 1}/{self.total_chunks} 异步转录成功")
         self.chunk_progress.emit(chunk_index, "completed", f"片段 {chunk_index + 1}/{self.total_chunks} 转录完成")
 
     def _on_async_chunk_failed(self, chunk_index: int, error_message: str):
         """异步片段失败回调"""
-        self.log_message.emit(f"片段 {chunk_index + 1}/{self.total_chunks} 处理失败: {error_message}")
+        chunk_index = self._chunk_index_map[chunk_index]
+        self.log_message.emit(f"{self._log_prefix}片段 {chunk_index + 1}/{self.total_chunks} 处理失败: {error_message}")
         self.chunk_progress.emit(chunk_index, "failed", f"片段 {chunk_index + 1}/{self.total_chunks} 处理失败")
 
-    def _on_async_all_completed(self, combined_transcript: dict):
+    def _on_async_all_completed(self):
         """所有异步片段完成回调"""
-        self.log_message.emit("所有片段异步处理完成，正在合并结果...")
-        self.combined_transcript = combined_transcript
+        self.log_message.emit(f"{self._log_prefix}所有片段异步处理完成，正在合并结果...")
 
         # 确保进度显示完成
         self.chunk_progress.emit(-1, "completed", "异步处理完成，正在生成字幕文件...")
@@ -408,8 +794,12 @@ class Worker(QObject):
         """异步处理失败回调"""
         self.log_message.emit(f"异步处理失败: {error_message}")
 
-        # 检查是否可以降级到顺序处理
-        if self.async_processor:
+        if self._is_cancelled:
+            self.error.emit("任务被用户取消。")
+            return
+
+        # 检查是否可以降级到顺序处理（已经是顺序处理时不再降级）
+        if self.async_processor and self.enable_async_processing:
             progress_info = self.async_processor.get_progress_info()
             completed_count = progress_info.get("completed_chunks", 0)
 
@@ -431,41 +821,19 @@ class Worker(QObject):
             # 禁用异步处理
             self.enable_async_processing = False
 
-            # 获取已完成的片段信息
-            if self.async_processor:
-                completed_chunks = self.async_processor.completed_chunks
-
-                # 合并已完成的片段结果
-                if completed_chunks:
-                    self.log_message.emit(f"合并已完成的 {len(completed_chunks)} 个片段结果...")
-
-                    # 按顺序合并已完成的片段（时间偏移已在异步处理器中处理）
-                    for chunk_index in sorted(completed_chunks.keys()):
-                        transcript_json = completed_chunks[chunk_index]
-
-                        if not self.combined_transcript:
-                            # 第一个片段作为模板
-                            self.combined_transcript = transcript_json.copy()
-                        else:
-                            # 后续片段直接追加（时间偏移已经在异步处理器中处理过）
-                            words = transcript_json.get("words", [])
-                            self.combined_transcript["words"].extend(words)
-                            if self.combined_transcript["text"]:
-                                self.combined_transcript["text"] += " "
-                            self.combined_transcript["text"] += transcript_json.get("text", "")
-
-                    # 更新当前处理索引
-                    self.current_chunk_index = max(completed_chunks.keys()) + 1
-
-                # 清理异步处理器
-                self.async_processor = None
+            # 已完成的片段结果已在 chunk_completed 回调中按索引记录
+            if self._chunk_transcripts:
+                self.log_message.emit(f"保留已完成的 {len(self._chunk_transcripts)} 个片段结果...")
 
-            # 继续顺序处理剩余片段
-            if self.current_chunk_index < self.total_chunks:
-                self.log_message.emit(f"继续顺序处理剩余 {self.total_chunks - self.current_chunk_index} 个片段...")
-                self._process_chunks_sequential()
+            # 以并发数 1 继续处理剩余片段（新处理器会替换并断开当前处理器）
+            remaining_indices = [i for i in range(self.total_chunks) if i not in self._chunk_transcripts]
+            if remaining_indices:
+                self.log_message.emit(f"继续顺序处理剩余 {len(remaining_indices)} 个片段...")
+                self._process_remaining_chunks(remaining_indices, restored=False)
             else:
                 # 所有片段都已完成
+                self._disconnect_async()
+                self.async_processor = None
                 self._finalize_task()
 
         except Exception as e:
@@ -477,95 +845,71 @@ class Worker(QObject):
         self.progress_updated.emit(bytes_sent, total_bytes)
 
         # 更新当前处理的片段索引（用于UI显示）
-        self.current_chunk_index = chunk_index
-
-    # === 恢复模式的异步处理回调方法 ===
-    def _on_async_chunk_started_restored(self, chunk_index: int):
-        """恢复模式：异步片段开始处理回调"""
-        # 调整索引以反映实际的全局片段位置
-        actual_chunk_index = self.current_chunk_index + chunk_index
-        self.log_message.emit(f"恢复模式：开始异步处理片段 {actual_chunk_index + 1}/{self.total_chunks}")
-        self.chunk_progress.emit(actual_chunk_index, "started", f"恢复处理片段 {actual_chunk_index + 1}/{self.total_chunks}")
-
-    def _on_async_chunk_completed_restored(self, chunk_index: int, transcript_json: dict):
-        """恢复模式：异步片段完成回调"""
-        # 调整索引以反映实际的全局片段位置
-        actual_chunk_index = self.current_chunk_index + chunk_index
-        self.log_message.emit(f"恢复模式：片段 {actual_chunk_index + 1}/{self.total_chunks} 异步转录成功")
-        self.chunk_progress.emit(actual_chunk_index, "completed", f"恢复片段 {actual_chunk_index + 1}/{self.total_chunks} 转录完成")
-        # transcript_json 在这里不需要特殊处理，由异步处理器自动合并
-
-    def _on_async_all_completed_restored(self, remaining_transcript: dict):
-        """恢复模式：所有剩余异步片段完成回调"""
-        self.log_message.emit("恢复模式：所有剩余片段异步处理完成，正在合并结果...")
-
-        # 合并已有的转录结果和新的转录结果
-        # 注意：remaining_transcript中的时间偏移已经在异步处理器中正确处理
-        if self.combined_transcript and self.combined_transcript.get("words"):
-            # 已有部分转录结果，需要合并
-            self.combined_transcript["words"].extend(remaining_transcript.get("words", []))
-            if self.combined_transcript["text"]:
-                self.combined_transcript["text"] += " "
-            self.combined_transcript["text"] += remaining_transcript.get("text", "")
-        else:
-            # 没有已有结果，直接使用新结果
-            self.combined_transcript = remaining_transcript
+        self.current_chunk_index = self._chunk_index_map[chunk_index]
 
-        self._finalize_task()
+    def _record_chunk(self, chunk_index: int, transcript_json: dict):
+        """按片段索引记录原始转录结果，时间偏移在合并时统一应用。"""
+        self._chunk_transcripts[chunk_index] = transcript_json
 
-    def _on_async_progress_updated_restored(self, chunk_index: int, bytes_sent: int, total_bytes: int):
-        """恢复模式：异步处理进度更新回调"""
-        # 转发进度信号到主窗口
-        self.progress_updated.emit(bytes_sent, total_bytes)
-        # chunk_index 用于标识片段，但在恢复模式下不需要特殊处理
+    def _build_combined_transcript(self) -> Dict[str, Any]:
+        """按片段顺序合并所有结果，一次性应用时间偏移并重建 words 列表。
 
-    def on_upload_finished(self, transcript_json):
-        """当一个片段上传和转录成功时调用。"""
-        self.log_message.emit(f"片段 {self.current_chunk_index + 1}/{self.total_chunks} 转录成功。")
-        
-        # 保存分段的 JSON 文件以供调试
-        try:
-            chunk_path = self.temp_chunks[self.current_chunk_index]
-            base_chunk_path, _ = os.path.splitext(chunk_path)
-            segment_json_path = base_chunk_path + ".json"
-            with open(segment_json_path, 'w', encoding='utf-8') as f:
-                json.dump(transcript_json, f, ensure_ascii=False, indent=4)
-            self.log_message.emit(f"分段转录JSON已保存到: {os.path.basename(segment_json_path)}")
-        except Exception as e:
-            self.log_message.emit(f"警告：保存分段JSON文件失败: {e}")
+        以第一个片段的元数据（如 language_code）为模板；原始片段数据不会被修改，
+        因此失败重试时可以安全地再次合并。
+        """
+        if not self._chunk_transcripts:
+            return {}
 
-        if not self.combined_transcript:
-            self.combined_transcript = transcript_json
-        else:
-            words = transcript_json.get("words", [])
-            for word in words:
-                word["start"] = round(word["start"] + self.time_offset, 3)
-                word["end"] = round(word["end"] + self.time_offset, 3)
-            self.combined_transcript["words"].extend(words)
-            self.combined_transcript["text"] += " " + transcript_json.get("text", "")
-        
-        self.current_chunk_index += 1
-        
-        if self.current_chunk_index < self.total_chunks:
-            self._process_next_chunk()
-        else:
-            # 这是最后一个片段，直接进入最终处理阶段
-            self._finalize_task()
+        order = sorted(self._chunk_transcripts)
+        combined = {
+            key: value for key, value in self._chunk_transcripts[order[0]].items()
+            if key not in ("words", "text")
+        }
+
+        words = []
+        texts = []
+        for chunk_index in order:
+            offset = chunk_index * self.split_duration_sec
+            for word in self._chunk_transcripts[chunk_index].get("words", []):
+                merged_word = dict(word)
+                merged_word["start"] = round(word["start"] + offset, 3)
+                merged_word["end"] = round(word["end"] + offset, 3)
+                words.append(merged_word)
+
+            text = self._chunk_transcripts[chunk_index].get("text", "")
+            if text:
+                texts.append(text)
+
+        combined["words"] = words
+        combined["text"] = " ".join(texts)
+        return combined
+
+    def _save_chunk_json(self, chunk_index: int, transcript_json: dict):
+        """将分段转录结果提交到 I/O 线程池写盘。"""
+        base_chunk_path, _ = os.path.splitext(self.temp_chunks[chunk_index])
+        # 分段 JSON 以紧凑格式写入；写入失败不影响任务
+        try:
+            self._io_pool.submit(write_json_atomic, base_chunk_path + ".json", transcript_json)
+        except RuntimeError:
+            # 取消时 I/O 线程池已关闭，不再写入
+            pass
 
-    def on_chunk_error(self, error_message: str):
-        """当处理片段出错时调用。"""
-        self.error.emit(f"处理片段 {self.current_chunk_index + 1}/{self.total_chunks} 时出错: {error_message}")
+    def _shutdown_io_pool(self, *_):
+        """关闭 I/O 线程池并等待已提交的分段 JSON 写完，检查点引用的分段 JSON 因此保持完整。"""
+        self._io_pool.shutdown(wait=True)
 
     def _finalize_task(self):
         """所有片段处理完毕后，合并结果并生成最终文件。"""
         self.log_message.emit("-" * 20)
         self.log_message.emit("所有片段处理完毕，正在生成最终文件...")
-        
+        # 等待分段 JSON 写完，单文件模式下分段 JSON 可能与最终 JSON 是同一路径
+        self._io_pool.shutdown(wait=True)
+        self.combined_transcript = self._build_combined_transcript()
+
         base_path, _ = os.path.splitext(self.original_file_path)
         output_json_path = base_path + ".json"
         try:
-            with open(output_json_path, 'w', encoding='utf-8') as f:
-                json.dump(self.combined_transcript, f, ensure_ascii=False, indent=4)
+            write_json_atomic(output_json_path, self.combined_transcript, indent=True)
             self.log_message.emit(f"合并后的转录文本已保存到:\n{output_json_path}")
         except Exception as e:
             self.error.emit(f"保存合并后的 JSON 文件时出错: {e}")
@@ -573,12 +917,13 @@ class Worker(QObject):
             return
 
         self.log_message.emit("正在生成SRT字幕文件...")
-        srt_data = create_srt_from_json(
+        srt_blocks = create_srt_from_json_iter(
             self.combined_transcript,
             max_subtitle_duration=self.max_subtitle_duration,
             subtitle_settings=self.subtitle_settings
         )
-        if not srt_data:
+        first_block = next(srt_blocks, None)
+        if first_block is None:
             self.error.emit("从合并后的JSON生成SRT失败。")
             # SRT生成失败时不清理临时文件，以便重试
             return
@@ -586,14 +931,17 @@ class Worker(QObject):
         output_srt_path = base_path + ".srt"
         task_success = False
         try:
-            with open(output_srt_path, 'w', encoding='utf-8') as f:
-                f.write(srt_data)
+            # 逐条写入字幕块，不在内存中拼出完整的 SRT 字符串
+            with open(output_srt_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(first_block)
+                f.writelines(srt_blocks)
             self.log_message.emit(f"最终SRT字幕文件已保存到:\n{output_srt_path}")
 
             # 在单文件处理模式下，清理冗余的临时JSON文件
             self._cleanup_temporary_json_files()
 
             task_success = True
+            self._remove_checkpoint()
             self.finished.emit("任务成功完成！")
         except Exception as e:
             self.error.emit(f"保存最终SRT文件时出错: {e}")
@@ -605,7 +953,9 @@ class Worker(QObject):
 
     def _cleanup_temporary_json_files(self):
         """清理单文件处理模式下的冗余临时JSON文件"""
-        if self.total_chunks == 1:
+        if self._debug_chunks:
+            self.log_message.emit("调试模式：保留分段JSON文件")
+        elif self.total_chunks == 1:
             # 单文件处理模式：检查是否需要清理临时JSON文件
             try:
                 chunk_path = self.temp_chunks[0]
@@ -626,25 +976,23 @@ class Worker(QObject):
 
             except (OSError, IndexError) as e:
                 self.log_message.emit(f"清理临时JSON文件时出错: {e}")
-        else:
-            # 多片段处理模式：保留临时JSON文件用于调试
-            self.log_message.emit("多片段处理模式：保留临时JSON文件用于调试")
 
     def request_cancellation(self):
         """请求取消当前任务。"""
         self.log_message.emit("正在取消上传...")
-        self._is_cancelled = True
+        with self._checkpoint_lock:
+            self._is_cancelled = True
 
-        # 取消异步处理器
+        # 取消异步处理器（同时中断正在进行的上传）
         if self.async_processor:
             self.async_processor.cancel()
 
-        # 取消当前上传器
-        if self.uploader:
-            self.uploader.cancel()
+        # 丢弃尚未开始的写盘任务；在界面线程中调用，不等待正在进行的写入，清理时会忽略已不存在的文件
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
 
-        # 用户取消时强制清理临时文件
+        # 用户取消时强制清理临时文件，检查点也不再需要
         self._cleanup_chunks(force_cleanup=True)
+        self._remove_checkpoint()
 
     def _cleanup_chunks(self, force_cleanup=False):
         """清理所有临时的音频片段文件。
@@ -659,24 +1007,20 @@ class Worker(QObject):
 
         self.log_message.emit("正在清理所有临时音频片段...")
 
-        # 清理音频片段文件
+        # 清理音频片段文件及对应的JSON文件，并发删除并汇总为一条日志
         if self.owned_temp_chunks:
-            for chunk_path in self.owned_temp_chunks:
-                try:
-                    if chunk_path and os.path.exists(chunk_path):
-                        os.remove(chunk_path)
-                        self.log_message.emit(f"已删除临时片段: {os.path.basename(chunk_path)}")
-
-                    # 同时删除对应的JSON文件
-                    if chunk_path:
-                        json_path = os.path.splitext(chunk_path)[0] + ".json"
-                        if os.path.exists(json_path):
-                            os.remove(json_path)
-                            self.log_message.emit(f"已删除片段JSON: {os.path.basename(json_path)}")
-
-                except (OSError, TypeError) as e:
-                    chunk_name = os.path.basename(chunk_path) if chunk_path else "未知文件"
-                    self.log_message.emit(f"清理文件 {chunk_name} 失败: {e}")
+            chunk_paths = [p for p in self.owned_temp_chunks if p]
+            targets = list(chunk_paths)
+            if not self._debug_chunks:
+                targets += [os.path.splitext(p)[0] + ".json" for p in chunk_paths]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(_remove_file, targets))
+
+            removed_count = sum(1 for removed, _ in results if removed)
+            self.log_message.emit(f"已删除 {removed_count} 个临时片段文件（{len(chunk_paths)} 个片段）")
+            for _, error in results:
+                if error:
+                    self.log_message.emit(f"清理文件失败: {error}")
             self.owned_temp_chunks = []
 
         # 清理提取的音频文件（如果是从视频提取的）
@@ -690,4 +1034,45 @@ class Worker(QObject):
             except (OSError, TypeError) as e:
                 self.log_message.emit(f"清理提取的音频文件失败: {e}")
 
-        self.log_message.emit("临时文件清理完成。")
\ No newline at end of file
+        self.log_message.emit("临时文件清理完成。")
+
+
+class JsonToSrtSignals(QObject):
+    """JsonToSrtTask 的信号。"""
+    finished = Signal(str)  # output_srt_path
+    error = Signal(str)
+
+
+class JsonToSrtTask(QRunnable):
+    """
+    在线程池中直接从已有的转录 JSON 文件生成 SRT，不进行 API 调用，也不阻塞界面线程。
+    """
+    def __init__(self, json_path: str, max_subtitle_duration: float, subtitle_settings: Optional[Dict] = None):
+        super().__init__()
+        self.signals = JsonToSrtSignals()
+        self.json_path = json_path
+        self.max_subtitle_duration = max_subtitle_duration
+        self.subtitle_settings = subtitle_settings
+
+    def run(self):
+        try:
+            json_data = load_json(self.json_path)
+            srt_blocks = create_srt_from_json_iter(
+                json_data,
+                max_subtitle_duration=self.max_subtitle_duration,
+                subtitle_settings=self.subtitle_settings
+            )
+            first_block = next(srt_blocks, None)
+            if first_block is None and not json_data.get("words"):
+                raise ValueError("JSON文件可能为空或不包含'words'数据。")
+
+            output_srt_path = os.path.splitext(self.json_path)[0] + ".srt"
+            with open(output_srt_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                if first_block is not None:
+                    f.write(first_block)
+                    f.writelines(srt_blocks)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+
+        self.signals.finished.emit(output_srt_path)
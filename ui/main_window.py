@@ -7,24 +7,24 @@
 import sys
 import os
 import json
+import time
 import ctypes
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QTextEdit, QFileDialog, QMessageBox, QComboBox, QProgressBar
+    QPlainTextEdit, QFileDialog, QMessageBox, QComboBox, QProgressBar
 )
 from PySide6.QtCore import QThread, Qt, QThreadPool, QTimer
-from PySide6.QtGui import QIcon
+from PySide6.QtGui import QIcon, QTextCursor
 
 # --- 从重构后的模块中导入 ---
 from core.config import (
     LANGUAGES, SETTINGS_FILE, MAX_SUBTITLE_DURATION,
-    DEFAULT_SPLIT_DURATION_MIN, DEFAULT_SUBTITLE_SETTINGS
+    DEFAULT_SPLIT_DURATION_MIN, DEFAULT_SUBTITLE_SETTINGS, VIDEO_EXTENSIONS, AUDIO_EXTENSIONS
 )
-from core.worker import Worker
+from core.worker import Worker, JsonToSrtTask
 from core.ffmpeg_utils import is_ffmpeg_available, extract_audio, get_media_info
-from core.srt_processor import create_srt_from_json
 from .widgets import CustomCheckBox
 from .settings_dialog import SettingsDialog
 from .async_settings_dialog import AsyncSettingsDialog
@@ -44,6 +44,22 @@ CODEC_EXTENSION_MAP = {
 }
 DEFAULT_AUDIO_EXTENSION = ".mka"  # Matroska Audio for unknown/other codecs
 
+# 文件选择对话框的过滤器，由支持的扩展名生成
+FILE_DIALOG_FILTER = (
+    "支持的文件 ("
+    + " ".join(f"*{ext}" for ext in sorted(AUDIO_EXTENSIONS | VIDEO_EXTENSIONS | {".json"}))
+    + ");;所有文件 (*)"
+)
+
+# 上传进度的整数百分比未变化时，两次刷新界面之间的最短间隔（秒）
+PROGRESS_REFRESH_INTERVAL_SEC = 0.05
+# 后台任务日志合并写入日志区域的间隔（毫秒）
+LOG_FLUSH_INTERVAL_MS = 80
+# 日志区域最多保留的行数
+LOG_MAX_BLOCKS = 2000
+# 不超过此大小的 JSON 文件直接在界面线程中生成 SRT，省去线程切换
+JSON_SYNC_MAX_BYTES = 256 * 1024
+
 
 class MainWindow(QMainWindow):
     """
@@ -61,11 +77,26 @@ class MainWindow(QMainWindow):
         self.thread = None
         self.worker = None
         self.temp_audio_file = None
+        self._json_task = None
+        self._drag_candidate: Optional[str] = None
         self.upload_complete_logged = False
+        # 上一次刷新进度条时的 (片段索引, 百分比) 与时刻，用于合并重复的进度更新
+        self._last_progress_key = None
+        self._last_progress_ts = 0.0
         
+        # ffprobe 结果缓存，键为 (路径, 修改时间, 文件大小)，文件变化后自动失效
+        self._probe_cache: Dict[tuple, Dict[str, Any]] = {}
+
         # 用于重试逻辑的状态存储
         self._pending_retry_state: Optional[Dict[str, Any]] = None
         
+        # 后台任务的日志先缓存，由定时器合并为一次写入，避免每条日志都触发重新排版
+        self._log_buffer: List[str] = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_timer.timeout.connect(self._flush_log)
+
         self.load_settings()
         self.setup_ui()
         
@@ -97,7 +128,9 @@ class MainWindow(QMainWindow):
         
         self.lang_label = QLabel("源语言:")
         self.lang_combo = QComboBox()
-        self.lang_combo.addItems(LANGUAGES.keys())
+        # 语言代码作为条目数据保存，读取时无需再按显示文本查表
+        for label, code in LANGUAGES.items():
+            self.lang_combo.addItem(label, code)
         self.lang_combo.setCurrentText("自动检测")
         
         self.audio_events_checkbox = CustomCheckBox("识别声音事件")
@@ -141,8 +174,10 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(action_layout)
         
         # --- 日志区域 ---
-        self.log_area = QTextEdit()
+        self.log_area = QPlainTextEdit()
         self.log_area.setReadOnly(True)
+        # 只保留最近的日志行，超出部分由 Qt 自动丢弃
+        self.log_area.setMaximumBlockCount(LOG_MAX_BLOCKS)
         self.log_area.setPlaceholderText("处理日志将在这里显示...")
         main_layout.addWidget(self.log_area)
         
@@ -171,14 +206,49 @@ class MainWindow(QMainWindow):
             except (AttributeError, TypeError, OSError) as e:
                 print(f"无法设置暗色标题栏: {e}")
 
+    def _append_log(self, message: str):
+        """缓存一条后台任务日志，稍后由 _flush_log 统一写入。"""
+        self._log_buffer.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _log(self, message: str):
+        """立即写入一条界面日志；先写入缓存中的后台日志，保证日志顺序不变。"""
+        self._flush_log()
+        self.log_area.appendPlainText(message)
+
+    def _flush_log(self):
+        """将缓存的日志一次性写入日志区域。"""
+        self._log_timer.stop()
+        if not self._log_buffer:
+            return
+        text = "\n".join(self._log_buffer)
+        self._log_buffer.clear()
+
+        scroll_bar = self.log_area.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        cursor = QTextCursor(self.log_area.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self.log_area.document().isEmpty():
+            text = "\n" + text
+        cursor.insertText(text)
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def _clear_log(self):
+        """清空日志区域及尚未写入的日志缓存。"""
+        self._log_timer.stop()
+        self._log_buffer.clear()
+        self.log_area.clear()
+
     def _check_ffmpeg(self) -> bool:
         """检查FFmpeg是否可用并记录日志。"""
         available = is_ffmpeg_available()
         if available:
-            self.log_area.append("✅ FFmpeg 已找到，将启用视频文件处理。")
+            self._log("✅ FFmpeg 已找到，将启用视频文件处理。")
         else:
-            self.log_area.append("⚠️ 未找到 FFmpeg。处理视频时将尝试直接上传原始文件。")
-            self.log_area.append("   为获得最佳体验，推荐安装 FFmpeg 并将其添加到系统 PATH。")
+            self._log("⚠️ 未找到 FFmpeg。处理视频时将尝试直接上传原始文件。")
+            self._log("   为获得最佳体验，推荐安装 FFmpeg 并将其添加到系统 PATH。")
         return available
 
     # --- 设置管理 ---
@@ -207,13 +277,21 @@ class MainWindow(QMainWindow):
             "max_concurrent_chunks": 3,
             "max_retries": 3,
             "api_rate_limit_per_minute": 30,
+
+            # 调试设置：为 True 时单文件任务也写出分段JSON，且任务完成后保留所有分段JSON
+            # （也可通过环境变量 SCRIBE2SRT_DEBUG_CHUNKS=1 开启）；界面中没有对应选项
+            "debug_chunks": False,
         }
 
+        # 最近一次与设置文件一致的设置内容，未变化时 save_settings 跳过写盘
+        self._saved_settings: Optional[Dict[str, Any]] = None
         if os.path.exists(SETTINGS_FILE):
             try:
                 with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
                     loaded_settings = json.load(f)
                     self.settings.update(loaded_settings)
+                    if self.settings == loaded_settings:
+                        self._saved_settings = dict(self.settings)
             except (json.JSONDecodeError, TypeError):
                 print(f"警告: 无法解析 {SETTINGS_FILE}。将使用默认设置。")
 
@@ -222,9 +300,22 @@ class MainWindow(QMainWindow):
         self.split_duration_min = self.settings["split_duration_min"]
 
     def save_settings(self):
-        """保存当前设置到文件。"""
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(self.settings, f, indent=4)
+        """保存当前设置到文件，设置未变化时不写盘。
+
+        先写入临时文件再替换，避免写入中断时留下损坏的设置文件。
+        """
+        if self.settings == self._saved_settings:
+            return
+
+        tmp_path = SETTINGS_FILE + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.settings, f, indent=4)
+            os.replace(tmp_path, SETTINGS_FILE)
+        except OSError as e:
+            self._log(f"保存设置失败: {e}")
+            return
+        self._saved_settings = dict(self.settings)
 
     def open_settings_dialog(self):
         """打开设置对话框并处理结果。"""
@@ -240,7 +331,7 @@ class MainWindow(QMainWindow):
             self.split_duration_min = new_settings["split_duration_min"]
 
             self.save_settings()
-            self.log_area.append("字幕生成设置已更新。")
+            self._log("字幕生成设置已更新。")
 
     def open_async_settings_dialog(self):
         """打开并发处理设置对话框并处理结果。"""
@@ -255,7 +346,7 @@ class MainWindow(QMainWindow):
             self.split_duration_min = new_settings["split_duration_min"]
 
             self.save_settings()
-            self.log_area.append("并发处理设置已更新。")
+            self._log("并发处理设置已更新。")
 
     # --- 文件处理与UI状态 ---
     def set_file(self, file_path: Optional[str]):
@@ -264,23 +355,17 @@ class MainWindow(QMainWindow):
             self.selected_file_path = file_path
             file_name = os.path.basename(file_path)
             self.file_drop_label.setText(f"已选择:\n{file_name}")
-            self.file_drop_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.start_button.setEnabled(True)
-            self.log_area.clear()
+            self._clear_log()
         else:
             self.selected_file_path = None
             self.file_drop_label.setText("将音视频或JSON文件拖拽到此处\n\n或")
-            self.file_drop_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.start_button.setEnabled(False)
 
     def select_file(self):
         """打开文件选择对话框。"""
         dialog_title = "选择文件"
-        dialog_filter = (
-            "支持的文件 (*.mp3 *.wav *.flac *.m4a *.aac *.mp4 *.mov *.mkv *.json);;"
-            "所有文件 (*)"
-        )
-        file_path, _ = QFileDialog.getOpenFileName(self, dialog_title, "", dialog_filter)
+        file_path, _ = QFileDialog.getOpenFileName(self, dialog_title, "", FILE_DIALOG_FILTER)
         self.set_file(file_path)
 
     def set_ui_enabled(self, enabled: bool):
@@ -322,12 +407,11 @@ class MainWindow(QMainWindow):
 
         file_to_process = self.selected_file_path
 
-        video_extensions = ['.mp4', '.mkv', '.mov', '.avi', '.flv', '.webm']
-        if ext.lower() in video_extensions:
+        if ext.lower() in VIDEO_EXTENSIONS:
             if self.ffmpeg_available:
-                self.log_area.append("检测到视频文件，正在分析音频流...")
+                self._log("检测到视频文件，正在分析音频流...")
 
-                media_info = get_media_info(self.selected_file_path, self.log_area.append)
+                media_info = self._get_media_info_cached(self.selected_file_path)
                 codec = media_info.get("codec") if media_info else None
 
                 if not codec:
@@ -335,54 +419,72 @@ class MainWindow(QMainWindow):
                     return
 
                 extension = CODEC_EXTENSION_MAP.get(codec, DEFAULT_AUDIO_EXTENSION)
-                self.log_area.append(f"检测到音频编码: {codec}。将使用 '{extension}' 容器进行提取。")
+                self._log(f"检测到音频编码: {codec}。将使用 '{extension}' 容器进行提取。")
 
                 base_name, _ = os.path.splitext(os.path.basename(self.selected_file_path))
                 temp_audio_path = os.path.join(os.path.dirname(self.selected_file_path), f"temp_audio_{base_name}{extension}")
 
-                self.log_area.append("正在提取音频...")
-                if not extract_audio(self.selected_file_path, temp_audio_path, self.log_area.append):
+                self._log("正在提取音频...")
+                if not extract_audio(self.selected_file_path, temp_audio_path, self._log):
                     self.on_task_error("音频提取失败。")
                     return
 
                 self.temp_audio_file = temp_audio_path
                 file_to_process = temp_audio_path
             else:
-                QMessageBox.warning(self, "功能限制", "检测到视频文件但未找到 FFmpeg。\n将尝试直接上传原始文件，但这可能失败。")
-                self.log_area.append("警告: 正在尝试直接上传视频文件...")
+                self._show_message(QMessageBox.Icon.Warning, "功能限制", "检测到视频文件但未找到 FFmpeg。\n将尝试直接上传原始文件，但这可能失败。")
+                self._log("警告: 正在尝试直接上传视频文件...")
 
         self._execute_transcription_task(file_to_process, self.selected_file_path)
 
+    def _get_media_info_cached(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """获取媒体信息；同一文件未被修改时复用上次的 ffprobe 结果。"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return get_media_info(file_path, self._log)
+
+        key = (file_path, stat.st_mtime_ns, stat.st_size)
+        if key not in self._probe_cache:
+            media_info = get_media_info(file_path, self._log)
+            if not media_info:
+                # 探测失败不缓存，下次重新尝试
+                return media_info
+            self._probe_cache[key] = media_info
+        return self._probe_cache[key]
+
     def _process_json_file_directly(self, json_path: str):
         """直接从JSON文件生成SRT，不进行API调用。"""
         self.set_ui_enabled(False)
-        self.log_area.clear()
-        self.log_area.append("="*50)
-        self.log_area.append(f"检测到JSON文件，直接生成SRT...")
-
+        self._clear_log()
+        self._log("="*50)
+        self._log(f"检测到JSON文件，直接生成SRT...")
+
+        # 较大的 JSON 在线程池中解析并生成 SRT，避免冻结界面；小文件直接同步处理
+        self._json_task = JsonToSrtTask(json_path, self.max_subtitle_duration, dict(self.settings))
+        self._json_task.signals.finished.connect(self._on_json_file_processed)
+        self._json_task.signals.error.connect(self._on_json_file_error)
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
-
-            # 移除pause_threshold参数，使用新的算法
-            srt_data = create_srt_from_json(
-                json_data,
-                max_subtitle_duration=self.max_subtitle_duration,
-                subtitle_settings=self.settings
-            )
-            if not srt_data and not json_data.get("words"):
-                raise ValueError("JSON文件可能为空或不包含'words'数据。")
-
-            output_srt_path = os.path.splitext(json_path)[0] + ".srt"
-            with open(output_srt_path, 'w', encoding='utf-8') as f:
-                f.write(srt_data)
-
-            self.log_area.append(f"SRT字幕文件已保存到:\n{output_srt_path}")
-            QMessageBox.information(self, "成功", "JSON文件处理成功！")
-        except (Exception) as e:
-            self.on_task_error(f"处理JSON文件时出错: {e}")
-        finally:
-            self.reset_ui_after_task()
+            run_inline = os.path.getsize(json_path) <= JSON_SYNC_MAX_BYTES
+        except OSError:
+            run_inline = True  # 由任务本身报告读取错误
+        if run_inline:
+            self._json_task.run()
+        else:
+            QThreadPool.globalInstance().start(self._json_task)
+
+    def _on_json_file_processed(self, output_srt_path: str):
+        """直接从JSON生成SRT成功时的处理。"""
+        self._json_task = None
+        self._log(f"SRT字幕文件已保存到:\n{output_srt_path}")
+        self._show_message(QMessageBox.Icon.Information, "成功", "JSON文件处理成功！")
+        self.reset_ui_after_task()
+
+    def _on_json_file_error(self, message: str):
+        """直接从JSON生成SRT失败时的处理。"""
+        self._json_task = None
+        self.on_task_error(f"处理JSON文件时出错: {message}")
+        self.reset_ui_after_task()
 
     def _execute_transcription_task(self, file_to_process, original_file, restore_state=None):
         """创建并启动后台Worker线程来执行转录任务。"""
@@ -394,15 +496,16 @@ class MainWindow(QMainWindow):
         if not restore_state:
             self.upload_complete_logged = False
             self.set_ui_enabled(False)
-            self.log_area.append("开始执行转录任务...")
+            self._log("开始执行转录任务...")
         else:
             # 重试模式下，只重置上传完成标志（UI状态已在 _setup_retry_ui 中设置）
             self.upload_complete_logged = False
+        self._last_progress_key = None
 
         self.thread = QThread()
         self.worker = Worker(
             file_path=file_to_process,
-            language_code=LANGUAGES.get(self.lang_combo.currentText(), "auto"),
+            language_code=self.lang_combo.currentData() or "auto",
             tag_audio_events=self.audio_events_checkbox.isChecked(),
             original_file_path=original_file,
             # 移除pause_threshold参数
@@ -422,7 +525,7 @@ class MainWindow(QMainWindow):
         # 连接Worker信号
         self.worker.finished.connect(self.on_task_finished)
         self.worker.error.connect(self.on_task_error)
-        self.worker.log_message.connect(self.log_area.append)
+        self.worker.log_message.connect(self._append_log)
         self.worker.progress_updated.connect(self.update_progress)
         self.worker.chunk_progress.connect(self.update_chunk_progress)
         self.worker.chunks_ready.connect(self.on_chunks_ready)
@@ -435,7 +538,7 @@ class MainWindow(QMainWindow):
 
     def cancel_process(self):
         """请求取消当前正在运行的任务。"""
-        self.log_area.append("\n正在请求取消任务...")
+        self._log("\n正在请求取消任务...")
         self._pending_retry_state = None # 取消时清除重试状态
 
         # 取消时清理临时文件
@@ -447,8 +550,9 @@ class MainWindow(QMainWindow):
     # --- 信号槽函数 ---
     def on_task_finished(self, message: str):
         """任务成功完成时的处理。"""
-        QMessageBox.information(self, "成功", message)
-        self.log_area.append(f"\n✅ {message}")
+        self._flush_log()
+        self._show_message(QMessageBox.Icon.Information, "成功", message)
+        self._log(f"\n✅ {message}")
 
         # 任务成功完成，清理临时文件并清除重试状态
         self._pending_retry_state = None
@@ -459,7 +563,7 @@ class MainWindow(QMainWindow):
 
     def on_task_error(self, message: str):
         """任务失败时的处理，提供重试选项。"""
-        self.log_area.append(f"\n❌ 任务失败: {message}")
+        self._log(f"\n❌ 任务失败: {message}")
 
         if "用户取消" in message or "cancelled" in message.lower():
             self._pending_retry_state = None
@@ -484,11 +588,29 @@ class MainWindow(QMainWindow):
         if self.thread:
             self.thread.quit()
 
+    def _show_message(self, icon: QMessageBox.Icon, title: str, text: str):
+        """以非模态方式显示提示框，不阻塞事件循环，后续清理工作可以立即执行。"""
+        box = QMessageBox(icon, title, text, QMessageBox.StandardButton.Ok, self)
+        box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        box.open()
+
     def update_progress(self, bytes_sent, total_bytes):
-        """更新上传进度条。"""
+        """更新上传进度条。
+
+        同一片段的整数百分比未变化且距上次刷新不足 PROGRESS_REFRESH_INTERVAL_SEC 时直接返回，
+        避免每次上传回调都触发控件重绘。
+        """
+        chunk_index = getattr(self.worker, 'current_chunk_index', 0) if self.worker else 0
+        percentage = bytes_sent * 100 // total_bytes if total_bytes > 0 else -1
+        now = time.monotonic()
+        if ((chunk_index, percentage) == self._last_progress_key
+                and now - self._last_progress_ts < PROGRESS_REFRESH_INTERVAL_SEC):
+            return
+        self._last_progress_key = (chunk_index, percentage)
+        self._last_progress_ts = now
+
         if self.worker and self.worker.total_chunks > 1:
             # 多片段模式：更新对应片段的进度
-            chunk_index = getattr(self.worker, 'current_chunk_index', 0)
             self.segmented_progress_bar.update_segment_progress(chunk_index, bytes_sent, total_bytes)
 
             # 多片段模式：不显示重复的文字进度，分段进度条已经提供了可视化信息
@@ -513,23 +635,19 @@ class MainWindow(QMainWindow):
         """更新片段处理进度。"""
         self.segmented_progress_bar.update_chunk_status(chunk_index, status)
         if message:
-            self.log_area.append(message)
+            self._append_log(message)
 
     def on_chunks_ready(self, chunk_paths):
         """当音频切分完成，设置分段进度条。"""
         self.segmented_progress_bar.set_segments(chunk_paths)
-        self.log_area.append(f"分段进度条已设置，共 {len(chunk_paths)} 个片段")
+        self._append_log(f"分段进度条已设置，共 {len(chunk_paths)} 个片段")
 
     def _handle_task_completion(self):
         """处理任务完成后的清理工作。"""
+        self._flush_log()
         # 只有在没有待重试状态时才清理临时音频文件
-        if not self._pending_retry_state and self.temp_audio_file and os.path.exists(self.temp_audio_file):
-            try:
-                os.remove(self.temp_audio_file)
-                self.log_area.append(f"已清理临时文件: {os.path.basename(self.temp_audio_file)}")
-                self.temp_audio_file = None
-            except OSError as e:
-                self.log_area.append(f"清理临时文件失败: {e}")
+        if not self._pending_retry_state:
+            self._cleanup_temp_audio_file()
 
         # 如果有待重试的状态，不要重置UI，直接执行重试
         if self._pending_retry_state:
@@ -541,7 +659,7 @@ class MainWindow(QMainWindow):
     def _execute_retry(self):
         """执行重试逻辑。"""
         if self._pending_retry_state:
-            self.log_area.append("\n🔄 正在重试...")
+            self._log("\n🔄 正在重试...")
             restore_state = self._pending_retry_state
             self._pending_retry_state = None
 
@@ -557,9 +675,9 @@ class MainWindow(QMainWindow):
                 extracted_audio = restore_state.get('extracted_audio_file')
                 if os.path.exists(extracted_audio):
                     file_to_process = extracted_audio
-                    self.log_area.append(f"重试时使用已提取的音频文件: {os.path.basename(extracted_audio)}")
+                    self._log(f"重试时使用已提取的音频文件: {os.path.basename(extracted_audio)}")
                 else:
-                    self.log_area.append("提取的音频文件不存在，将重新提取...")
+                    self._log("提取的音频文件不存在，将重新提取...")
 
             # 重新执行任务
             self._execute_transcription_task(
@@ -587,34 +705,47 @@ class MainWindow(QMainWindow):
             file_path = restore_state.get('extracted_audio_file') or restore_state.get('file_path')
             if file_path:
                 self.segmented_progress_bar.set_single_file_mode(file_path)
-                self.log_area.append("重试：设置单文件进度条模式")
+                self._log("重试：设置单文件进度条模式")
         else:
             # 多片段模式
             temp_chunks = restore_state.get('temp_chunks', [])
             if temp_chunks:
                 self.segmented_progress_bar.set_segments(temp_chunks)
-                self.log_area.append(f"重试：设置多片段进度条模式，共 {len(temp_chunks)} 个片段")
+                self._log(f"重试：设置多片段进度条模式，共 {len(temp_chunks)} 个片段")
 
     def _cleanup_temp_audio_file(self):
         """清理临时音频文件。"""
-        if self.temp_audio_file and os.path.exists(self.temp_audio_file):
+        if self.temp_audio_file:
+            # 直接删除，文件已不存在时忽略，避免先 exists 再 remove 的两次系统调用
             try:
                 os.remove(self.temp_audio_file)
-                self.log_area.append(f"已清理临时文件: {os.path.basename(self.temp_audio_file)}")
+                self._log(f"已清理临时文件: {os.path.basename(self.temp_audio_file)}")
+            except FileNotFoundError:
+                pass
             except OSError as e:
-                self.log_area.append(f"清理临时文件失败: {e}")
+                self._log(f"清理临时文件失败: {e}")
             finally:
                 self.temp_audio_file = None
 
     # --- 拖放功能 ---
     def dragEnterEvent(self, event):
-        """处理拖拽进入事件。"""
-        if event.mimeData().hasUrls():
-            event.acceptProposedAction()
+        """处理拖拽进入事件。
+
+        只接受本地文件（不接受目录和非本地 URL），并记下文件路径供 dropEvent 直接使用。
+        """
+        self._drag_candidate = None
+        mime_data = event.mimeData()
+        if not mime_data.hasUrls():
+            return
+        urls = mime_data.urls()
+        if urls and urls[0].isLocalFile():
+            file_path = urls[0].toLocalFile()
+            if not os.path.isdir(file_path):
+                self._drag_candidate = file_path
+                event.acceptProposedAction()
 
     def dropEvent(self, event):
         """处理文件拖放事件。"""
-        urls = event.mimeData().urls()
-        if urls:
-            file_path = urls[0].toLocalFile()
-            self.set_file(file_path)
+        if self._drag_candidate:
+            self.set_file(self._drag_candidate)
+            self._drag_candidate = None
@@ -111,7 +111,10 @@ class SegmentedProgressBar(QWidget):
             segment = self.segments[segment_index]
 
             if total_bytes > 0:
-                progress = int((bytes_sent / total_bytes) * 100)
+                progress = bytes_sent * 100 // total_bytes
+                if progress == segment['progress']:
+                    # 百分比未变化，无需重绘进度条和重新计算总体进度文字
+                    return
                 segment['progress'] = progress
 
                 if segment['progress_bar']: